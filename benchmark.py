@@ -0,0 +1,444 @@
+import os
+import sys
+import json
+import time
+import wave
+import platform
+import subprocess
+import argparse
+import resource
+import multiprocessing as mp
+
+import numpy as np
+
+from prosody_profiles import PRESETS, make_analyzer
+
+# ==========================================
+# [설정] 기본 벤치마크 조건
+# ==========================================
+DEFAULT_DURATIONS = [10, 60, 300, 1800, 3600]   # 10초 ~ 60분
+DEFAULT_PRESETS = list(PRESETS)
+SAMPLE_RATE = 16000
+WORK_DIR = "bench_audio"
+
+# 모음별 포먼트 (F1, F2, F3) - 합성 음성의 음절마다 하나씩 선택
+VOWELS = [
+    (800, 1200, 2500), (500, 1900, 2500), (300, 2300, 3000),
+    (500, 900, 2400), (350, 800, 2300),
+]
+
+
+# ==========================================
+# 합성 음성 생성 (Deterministic)
+# ==========================================
+def _formant_envelope(freqs, formants, bandwidths=(80, 100, 150)):
+    """포먼트 공명 피크의 합으로 만든 스펙트럼 포락선 (+ 고역 감쇠)"""
+    env = np.zeros_like(freqs)
+    for f, bw in zip(formants, bandwidths):
+        env += 1.0 / np.sqrt(1.0 + ((freqs - f) / (bw / 2.0)) ** 2)
+    return env / (1.0 + freqs / 1000.0)
+
+
+def _filtered(source, envelope_fn, sample_rate):
+    """FFT 영역에서 포락선을 곱해 필터링 (scipy 없이 포먼트 필터 적용)"""
+    spec = np.fft.rfft(source)
+    freqs = np.fft.rfftfreq(source.size, 1.0 / sample_rate)
+    out = np.fft.irfft(spec * envelope_fn(freqs), n=source.size)
+    peak = np.max(np.abs(out))
+    return out / peak if peak > 0 else out
+
+
+def iter_synth_speech(duration, sample_rate=SAMPLE_RATE, seed=0):
+    """
+    음성과 유사한 합성 신호를 구간 단위로 생성 (같은 seed -> 같은 신호)
+    - 발화 구간(0.8~3초): 음절(0.12~0.3초)마다 F0가 변하는 유성음(톱니파 + 모음 포먼트 필터)
+      또는 포먼트 필터링된 잡음(무성 마찰음)
+    - 발화 사이 휴지(0.2~1.5초, 가끔 2~3초) + 낮은 배경 잡음
+    """
+    rng = np.random.default_rng(seed)
+    total = int(round(duration * sample_rate))
+    pos = 0
+    base_f0 = rng.uniform(100, 220)
+    phase = 0.0
+    while pos < total:
+        # [1] 발화 구간
+        utt = np.zeros(int(rng.uniform(0.8, 3.0) * sample_rate))
+        i = 0
+        while i < utt.size:
+            n = min(utt.size - i, int(rng.uniform(0.12, 0.3) * sample_rate))
+            t = np.arange(n) / sample_rate
+            if rng.random() < 0.8:
+                # 유성음: 억양(F0 변화)이 있는 톱니파 -> 모음 포먼트 필터
+                f0 = base_f0 * (1 + rng.uniform(-0.15, 0.15)) * (1 + 0.05 * np.sin(2 * np.pi * 3 * t))
+                ph = phase + np.cumsum(f0) / sample_rate
+                phase = ph[-1] % 1.0
+                vowel = VOWELS[rng.integers(len(VOWELS))]
+                seg = _filtered(2 * (ph % 1.0) - 1, lambda f: _formant_envelope(f, vowel), sample_rate)
+            else:
+                # 무성음: 고역 포먼트로 필터링된 잡음
+                center = rng.uniform(3500, 6000)
+                seg = 0.4 * _filtered(rng.standard_normal(n),
+                                      lambda f: _formant_envelope(f, (center,), (1500,)), sample_rate)
+            # 음절 경계 클릭 방지용 페이드
+            fade = np.minimum(1.0, np.minimum(t, t[-1] - t) / 0.01)
+            utt[i:i + n] = seg * fade * rng.uniform(0.5, 1.0)
+            i += n
+
+        # [2] 휴지 구간
+        pause = rng.uniform(2.0, 3.0) if rng.random() < 0.1 else rng.uniform(0.2, 1.5)
+        chunk = np.concatenate([0.5 * utt, np.zeros(int(pause * sample_rate))])
+        chunk = chunk[:total - pos]
+        chunk += 0.0005 * rng.standard_normal(chunk.size)
+        pos += chunk.size
+        yield chunk
+
+
+def synth_speech(duration, sample_rate=SAMPLE_RATE, seed=0):
+    """합성 음성 전체를 float 배열로 반환"""
+    return np.concatenate(list(iter_synth_speech(duration, sample_rate, seed)))
+
+
+def write_synth_wav(path, duration, sample_rate=SAMPLE_RATE, seed=0):
+    """합성 음성을 16bit Mono WAV로 저장 (구간 단위로 기록 -> 긴 파일도 메모리 일정)"""
+    with wave.open(path, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(sample_rate)
+        for chunk in iter_synth_speech(duration, sample_rate, seed):
+            w.writeframes((np.clip(chunk, -1, 1) * 32767).astype("<i2").tobytes())
+
+
+# ==========================================
+# 측정 (케이스마다 새 프로세스 -> peak RSS 분리)
+# ==========================================
+def _peak_rss_mb():
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux: KB, macOS: bytes
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def _cpu_seconds():
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)   # FFmpeg 프로세스 포함
+    return own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+
+
+def _run_case(preset, wav_path, duration):
+    """analyze()의 단계별 계측(StageTimer)으로 wall time 측정"""
+    from prosody_timing import StageTimer
+
+    analyzer = make_analyzer(preset)
+    timer = StageTimer()
+    cpu0, wall0 = _cpu_seconds(), time.perf_counter()
+
+    sound = timer.run("decode", lambda: analyzer._load_sound(wav_path))
+    analyzer._analyze_sound(sound, timer=timer)
+    stages = {stage: round(rec["seconds"], 4) for stage, rec in timer.stages.items()}
+
+    wall = time.perf_counter() - wall0
+    cpu = _cpu_seconds() - cpu0
+    return {
+        "preset": preset,
+        "audio_seconds": duration,
+        "stages": stages,
+        "wall_total": round(wall, 4),
+        "cpu_total": round(cpu, 4),
+        "throughput": round(duration / cpu, 2) if cpu > 0 else None,   # audio-sec / CPU-sec
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+    }
+
+
+def run(durations, presets, seed=0, work_dir=WORK_DIR):
+    """모든 (preset, duration) 조합을 측정하여 결과 dict 반환"""
+    import parselmouth
+    os.makedirs(work_dir, exist_ok=True)
+    ctx = mp.get_context("spawn")
+    results = {}
+    for duration in durations:
+        wav_path = os.path.join(work_dir, f"synth_{duration}s_seed{seed}.wav")
+        if not os.path.exists(wav_path):
+            print(f"[gen] {wav_path}")
+            write_synth_wav(wav_path, duration, seed=seed)
+        for preset in presets:
+            with ctx.Pool(1) as pool:
+                res = pool.apply(_run_case, (preset, wav_path, duration))
+            key = f"{preset}@{duration}s"
+            results[key] = res
+            print(f"[run] {key:<14} wall {res['wall_total']:>9.3f}s  "
+                  f"{res['throughput']:>8} audio-s/CPU-s  peak {res['peak_rss_mb']:>7.1f} MB")
+
+    return {
+        "meta": {
+            "date": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "parselmouth": parselmouth.VERSION,
+            "cpu_count": os.cpu_count(),
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+
+def compare(baseline, current, threshold=0.15, min_delta=0.005):
+    """
+    기준 결과 대비 회귀 탐지
+    - 단계별/전체 wall time이 (1 + threshold)배 이상, min_delta초 이상 느려지면 회귀
+    - peak RSS가 (1 + threshold)배 이상 늘어도 회귀
+    반환: 회귀 목록 [(케이스, 항목, 기준값, 현재값)]
+    """
+    regressions = []
+    for key, cur in current["results"].items():
+        base = baseline["results"].get(key)
+        if base is None:
+            continue
+        pairs = [("wall_total", base["wall_total"], cur["wall_total"])]
+        pairs += [(f"stage:{s}", base["stages"][s], v) for s, v in cur["stages"].items() if s in base["stages"]]
+        for name, old, new in pairs:
+            if new > old * (1 + threshold) and new - old > min_delta:
+                regressions.append((key, name, old, new))
+        if cur["peak_rss_mb"] > base["peak_rss_mb"] * (1 + threshold):
+            regressions.append((key, "peak_rss_mb", base["peak_rss_mb"], cur["peak_rss_mb"]))
+
+        speedup = base["wall_total"] / cur["wall_total"] if cur["wall_total"] > 0 else float("inf")
+        print(f"[cmp] {key:<14} wall {base['wall_total']:.3f}s -> {cur['wall_total']:.3f}s  (x{speedup:.2f})")
+    return regressions
+
+
+def _score_values(result):
+    return {c: (v["score"] if isinstance(v, dict) else v) for c, v in result["scores"].items()}
+
+
+def _analyze_timed(preset, path, **options):
+    """(결과, 분석 소요 시간 합계, 오디오 길이) - 실패 시 None"""
+    res = make_analyzer(preset, timings=True, **options).analyze(path)
+    if res is None:
+        return None
+    timings = res["metadata"]["timings"]
+    return res, sum(r["seconds"] for r in timings.values()), timings.get("decode", {}).get("duration", 0)
+
+
+def _diff(base, test):
+    """(Feature별 상대 오차, 카테고리별 점수 차이) - 기준값이 0인 Feature는 절대 오차"""
+    features = {k: float(abs(test["raw_features"][k] - v) / abs(v)) if v else float(abs(test["raw_features"][k]))
+                for k, v in base["raw_features"].items()}
+    base_scores, test_scores = _score_values(base), _score_values(test)
+    return features, {c: round(float(test_scores[c] - s), 4) for c, s in base_scores.items()}
+
+
+def media_paths(paths, durations=(), work_dir=WORK_DIR):
+    """파일 / 폴더 목록 -> 미디어 파일 목록 (없으면 합성 음성 생성)"""
+    from prosody_audio import media_files
+    out = media_files(paths)
+    if not paths:
+        os.makedirs(work_dir, exist_ok=True)
+        for duration in [int(d) if float(d).is_integer() else d for d in durations]:
+            path = os.path.join(work_dir, f"synth_{duration}s_seed0.wav")
+            if not os.path.exists(path):
+                write_synth_wav(path, duration)
+            out.append(path)
+    return out
+
+
+def drift(paths, presets, **options):
+    """
+    분석 옵션(예: sounding_only=True) 적용 시 기본 분석 대비 속도 / Feature / 점수 변화 측정
+    반환: {"파일|preset": {"speedup", "feature_rel_drift", "score_drift"}}
+    """
+    report = {}
+    for path in paths:
+        for preset in presets:
+            base, test = _analyze_timed(preset, path), _analyze_timed(preset, path, **options)
+            if base is None or test is None:
+                print(f"[drift] {path} {preset}: 분석 실패")
+                continue
+            features, scores = _diff(base[0], test[0])
+            key = f"{os.path.basename(path)}|{preset}"
+            report[key] = {"speedup": round(base[1] / test[1], 3), "feature_rel_drift": features, "score_drift": scores}
+            print(f"[drift] {key:<30} x{base[1] / test[1]:.2f}  score drift {scores}")
+    return report
+
+
+def calibrate(paths, preset, profiles, reference="research", tolerance=0.05):
+    """
+    각 프로파일을 reference 프로파일과 비교 (같은 분석기 / 가중치, 프로파일만 변경)
+    - throughput: 오디오 초 / 분석 초
+    - Feature별 상대 오차, 카테고리별 점수 절대 오차 (파일 평균 / 최대)
+    - 점수 최대 오차가 tolerance 이내인 프로파일 중 가장 빠른 것을 추천
+    """
+    refs = {path: _analyze_timed(preset, path, profile=reference) for path in paths}
+    refs = {path: r for path, r in refs.items() if r is not None}
+    report = {"preset": preset, "reference": reference, "tolerance": tolerance, "profiles": {}}
+
+    for profile in [reference] + [p for p in profiles if p != reference]:
+        name = profile if isinstance(profile, str) else json.dumps(profile, sort_keys=True)
+        seconds = audio = 0.0
+        feature_errs, score_errs = {}, {}
+        for path, (ref, _, _) in refs.items():
+            res = _analyze_timed(preset, path, profile=profile)
+            if res is None:
+                continue
+            seconds, audio = seconds + res[1], audio + res[2]
+            features, scores = _diff(ref, res[0])
+            for k, v in features.items():
+                feature_errs.setdefault(k, []).append(v)
+            for c, v in scores.items():
+                score_errs.setdefault(c, []).append(abs(v))
+
+        summary = lambda errs: {k: {"mean": round(float(np.mean(v)), 4), "max": round(float(np.max(v)), 4)}
+                                for k, v in errs.items()}
+        max_score_err = max((max(v) for v in score_errs.values()), default=0.0)
+        report["profiles"][name] = {
+            "throughput": round(audio / seconds, 2) if seconds > 0 else None,
+            "feature_rel_error": summary(feature_errs),
+            "score_abs_error": summary(score_errs),
+            "max_score_error": round(max_score_err, 4),
+            "within_tolerance": max_score_err <= tolerance,
+        }
+        print(f"[calibrate] {name:<12} {report['profiles'][name]['throughput']:>8} audio-s/s  "
+              f"max score error {max_score_err:.4f}  {'OK' if max_score_err <= tolerance else '-'}")
+
+    ok = [(r["throughput"] or 0, name) for name, r in report["profiles"].items() if r["within_tolerance"]]
+    report["recommended"] = max(ok)[1] if ok else reference
+    print(f"[calibrate] 추천 프로파일: {report['recommended']}")
+    return report
+
+
+# ==========================================
+# 시작 비용 (cold start: 새 Python 프로세스에서 import ~ 첫 결과)
+# ==========================================
+_STARTUP_SCRIPT = """
+import sys, json, time
+t0 = time.perf_counter()
+import {module}
+t1 = time.perf_counter()
+analyzer = {module}.{cls}()
+t2 = time.perf_counter()
+res = analyzer.analyze(sys.argv[1])
+t3 = time.perf_counter()
+print(json.dumps({{"import": t1 - t0, "init": t2 - t1, "first_result": t3 - t0,
+                  "ok": res is not None, "modules": len(sys.modules)}}))
+"""
+
+
+def startup(presets, wav_path, repeats=5):
+    """
+    preset마다 새 Python 프로세스를 repeats번 실행하여 중앙값 측정 (ms)
+    - import: 분석기 모듈 import, init: 분석기 생성, first_result: import 시작 ~ 첫 analyze 결과
+    - process: 인터프리터 시작부터 종료까지 (서버리스 cold start에 가까운 값)
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+    report = {}
+    for preset in presets:
+        module, cls = PRESETS[preset]
+        script = _STARTUP_SCRIPT.format(module=module, cls=cls)
+        runs = []
+        for _ in range(repeats):
+            t = time.perf_counter()
+            proc = subprocess.run([sys.executable, "-c", script, wav_path], cwd=here,
+                                  capture_output=True, text=True, check=True)
+            rec = json.loads(proc.stdout.strip().splitlines()[-1])
+            rec["process"] = time.perf_counter() - t
+            runs.append(rec)
+        report[preset] = {k: round(float(np.median([r[k] for r in runs])) * 1000, 1)
+                          for k in ("import", "init", "first_result", "process")}
+        report[preset]["modules"] = runs[-1]["modules"]
+        report[preset]["ok"] = all(r["ok"] for r in runs)
+        r = report[preset]
+        print(f"[startup] {preset:<6} import {r['import']:>7.1f}ms  init {r['init']:>6.2f}ms  "
+              f"first result {r['first_result']:>7.1f}ms  process {r['process']:>7.1f}ms  ({r['modules']} modules)")
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prosody 분석 벤치마크 (합성 음성)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_run = sub.add_parser("run", help="벤치마크 실행 후 JSON 저장")
+    p_run.add_argument("--durations", type=float, nargs="+", default=DEFAULT_DURATIONS)
+    p_run.add_argument("--presets", nargs="+", choices=DEFAULT_PRESETS, default=DEFAULT_PRESETS)
+    p_run.add_argument("--seed", type=int, default=0)
+    p_run.add_argument("--work-dir", default=WORK_DIR)
+    p_run.add_argument("--out", default="bench_results.json")
+    p_run.add_argument("--compare", help="비교할 기준 JSON (회귀 시 exit code 1)")
+    p_run.add_argument("--threshold", type=float, default=0.15)
+
+    p_cmp = sub.add_parser("compare", help="저장된 두 JSON 비교")
+    p_cmp.add_argument("baseline")
+    p_cmp.add_argument("current")
+    p_cmp.add_argument("--threshold", type=float, default=0.15)
+
+    p_drift = sub.add_parser("drift", help="옵션 적용 시 기본 분석 대비 점수 변화 (예: --sounding-only)")
+    p_drift.add_argument("paths", nargs="*", help="분석할 파일 (없으면 합성 음성 사용)")
+    p_drift.add_argument("--durations", type=float, nargs="+", default=[60, 300])
+    p_drift.add_argument("--presets", nargs="+", choices=DEFAULT_PRESETS, default=DEFAULT_PRESETS)
+    p_drift.add_argument("--sounding-only", action="store_true")
+    p_drift.add_argument("--work-dir", default=WORK_DIR)
+    p_drift.add_argument("--out")
+
+    p_cal = sub.add_parser("calibrate", help="프로파일별 속도 / 오차를 research 프로파일과 비교")
+    p_cal.add_argument("paths", nargs="*", help="분석할 파일 또는 폴더 (없으면 합성 음성 사용)")
+    p_cal.add_argument("--profiles", nargs="+", default=["realtime", "standard"],
+                       help='프로파일 이름 또는 JSON (예: \'{"time_step": 0.03}\')')
+    p_cal.add_argument("--reference", default="research")
+    p_cal.add_argument("--preset", choices=DEFAULT_PRESETS, default="light")
+    p_cal.add_argument("--tolerance", type=float, default=0.05, help="허용 점수 오차 (절대값)")
+    p_cal.add_argument("--durations", type=float, nargs="+", default=[60, 300])
+    p_cal.add_argument("--work-dir", default=WORK_DIR)
+    p_cal.add_argument("--out")
+
+    p_start = sub.add_parser("startup", help="새 프로세스에서 import 시간 / 첫 결과까지 시간 측정")
+    p_start.add_argument("path", nargs="?", help="분석할 파일 (없으면 10초 합성 음성)")
+    p_start.add_argument("--presets", nargs="+", choices=DEFAULT_PRESETS, default=DEFAULT_PRESETS)
+    p_start.add_argument("--repeats", type=int, default=5)
+    p_start.add_argument("--work-dir", default=WORK_DIR)
+    p_start.add_argument("--out")
+
+    args = parser.parse_args(argv)
+    if args.command == "startup":
+        path = args.path or media_paths([], [10], args.work_dir)[0]
+        report = startup(args.presets, os.path.abspath(path), repeats=args.repeats)
+        if args.out:
+            with open(args.out, "w") as f:
+                json.dump(report, f, indent=2)
+        return 0
+
+    if args.command in ("drift", "calibrate"):
+        paths = media_paths(args.paths, args.durations, args.work_dir)
+        if args.command == "drift":
+            report = drift(paths, args.presets, sounding_only=args.sounding_only)
+        else:
+            profiles = [json.loads(p) if p.startswith("{") else p for p in args.profiles]
+            report = calibrate(paths, args.preset, profiles, reference=args.reference, tolerance=args.tolerance)
+        if args.out:
+            with open(args.out, "w") as f:
+                json.dump(report, f, indent=2)
+        return 0
+
+    if args.command == "run":
+        durations = [int(d) if float(d).is_integer() else d for d in args.durations]
+        current = run(durations, args.presets, seed=args.seed, work_dir=args.work_dir)
+        with open(args.out, "w") as f:
+            json.dump(current, f, indent=2)
+        print(f"[save] {args.out}")
+        if not args.compare:
+            return 0
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    else:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        with open(args.current) as f:
+            current = json.load(f)
+
+    regressions = compare(baseline, current, threshold=args.threshold)
+    for key, name, old, new in regressions:
+        print(f"[REGRESSION] {key} {name}: {old} -> {new}")
+    if not regressions:
+        print("회귀 없음")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
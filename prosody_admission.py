@@ -0,0 +1,188 @@
+import sys
+
+from prosody_audio import probe_media
+from prosody_timing import timed
+
+# ==========================================
+# 업로드 허용 검사 / 메모리 예산
+# ==========================================
+# 디코딩 전에 길이와 스트림 구성을 확인하고, 예상 메모리가 예산을 넘으면 정책에 따라 처리
+# - reject: 분석하지 않음 (None 반환)
+# - truncate: 예산 안에 들어오는 앞부분만 분석 (metadata["memory"]["truncated_to"])
+# - chunked: 세그먼트 1개씩 순서대로 분석 (analyze_long, 메모리는 세그먼트 1개 분량)
+POLICIES = ("reject", "truncate", "chunked")
+
+# 요청 1개의 최대 RSS 증가량 모델 (바이트) = base + 길이(초) x (per_sample x 샘플레이트 + per_frame / time_step)
+# - 측정값: Light / All Feature 모두 16kHz 기준 약 1.1 MiB/초 (대부분 침묵 TextGrid / Formant 내부 리샘플링)
+# - 입력 파일 형식(샘플레이트, 채널)과 무관 (분석 샘플레이트로 디코딩 후 분석)
+# - 측정값보다 약간 크게 잡은 값, 배포 환경에서는 fit_memory_model로 다시 측정 가능
+MEMORY_MODEL = {"base": 16 << 20, "per_sample": 75, "per_frame": 500}
+
+# chunked 정책의 세그먼트 길이 범위 (초), 세그먼트에 쓰는 예산 비율 (병합 버퍼 / 스레드별 할당 영역 등 모델 밖 변동 여유)
+MIN_SEGMENT = 30.0
+MAX_SEGMENT = 300.0
+CHUNK_HEADROOM = 0.8
+
+
+def _status_bytes(key):
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith(key):
+                return int(line.split()[1]) * 1024
+    return None
+
+
+class PeakMemory:
+    """
+    with 블록 동안의 최대 RSS (바이트)
+    - Linux: /proc/self/clear_refs로 최고치(VmHWM)를 초기화한 뒤 측정 -> 요청 1개 기준 (scope "request")
+    - 그 외: 프로세스 시작 후 최고치 (scope "process")
+    - 워커 프로세스(concurrent_stages / analyze_long 병렬)의 메모리는 포함하지 않음
+    """
+
+    def __enter__(self):
+        self.peak = None
+        self.start = None
+        try:
+            with open("/proc/self/clear_refs", "w") as f:
+                f.write("5")
+            self.start = _status_bytes("VmRSS")
+            self.scope = "request"
+        except OSError:
+            self.scope = "process"
+        return self
+
+    def __exit__(self, *exc):
+        if self.scope == "request":
+            self.peak = _status_bytes("VmHWM")
+        else:
+            try:
+                import resource
+                rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+                self.peak = rss if sys.platform == "darwin" else rss * 1024   # macOS는 바이트, Linux는 KB
+            except ImportError:
+                pass
+        return False
+
+    def report(self):
+        """{"peak_rss", "peak_increase"(request scope만), "scope"}"""
+        out = {"peak_rss": self.peak, "scope": self.scope}
+        if self.start is not None and self.peak is not None:
+            out["peak_increase"] = self.peak - self.start
+        return out
+
+
+def estimate_memory(model, params, duration):
+    """duration(초) 분석 시 예상 최대 메모리 증가량 (바이트)"""
+    per_second = model["per_sample"] * params["sample_rate"] + model["per_frame"] / params["time_step"]
+    return int(model["base"] + duration * per_second)
+
+
+def budget_duration(model, params, budget):
+    """예산 안에서 분석 가능한 최대 길이 (초)"""
+    per_second = model["per_sample"] * params["sample_rate"] + model["per_frame"] / params["time_step"]
+    return max(0.0, (budget - model["base"]) / per_second)
+
+
+def fit_memory_model(analyzer, paths, margin=1.05):
+    """
+    배포 환경에서 메모리 모델 다시 측정: 길이가 다른 파일들을 분석하여 최대 RSS 증가량을 직선으로 근사
+    - per_frame은 0으로 두고 per_sample만 조정 (프로파일별로 따로 측정), margin만큼 여유를 둠
+    - Linux 전용 (요청 단위 최고치 측정 필요)
+    """
+    params = analyzer.engine_params
+    analyzer.analyze(paths[0])   # import / 첫 호출 비용 제외
+    points = []
+    for path in paths:
+        info = probe_media(path)
+        with PeakMemory() as peak:
+            analyzer.analyze(path)
+        if peak.scope != "request":
+            raise RuntimeError("fit_memory_model requires /proc/self/clear_refs (Linux)")
+        points.append((info["duration"] * params["sample_rate"], peak.report()["peak_increase"]))
+    slope = max(used / n for n, used in points if n > 0)
+    base = max(0, max(used - slope * n for n, used in points))
+    return {"base": int(base * margin), "per_sample": slope * margin, "per_frame": 0}
+
+
+# chunked 정책(analyze_long)에서 적용되지 않는 분석기 옵션 -> metadata["memory"]["dropped"]
+CHUNKED_UNSUPPORTED = ("keep_tracks", "keep_summary", "sounding_only", "concurrent_stages")
+
+
+def admission_plan(analyzer, file_path, info):
+    """
+    probe 결과 -> metadata["memory"] dict (mode: full / truncate / chunked), 처리하지 않을 입력이면 None
+    - truncate: truncated_to (초), chunked: segment_duration (초) / dropped (적용되지 않는 옵션)
+    """
+    if info is None:
+        print(f"[Analysis Error] cannot read media: {file_path}")
+        return None
+    if not info["audio"]:
+        print(f"[Analysis Error] no audio stream: {file_path}")
+        return None
+
+    params = analyzer.engine_params
+    model = analyzer.memory_model or MEMORY_MODEL
+    budget = analyzer.memory_budget
+    duration = info["duration"]
+    # 길이를 알 수 없으면 (일부 스트리밍 형식) 예산 초과로 간주
+    estimate = estimate_memory(model, params, duration) if duration is not None else None
+    memory = {"duration": duration, "estimate": estimate, "budget": budget, "mode": "full"}
+
+    if estimate is not None and estimate <= budget:
+        return memory
+    if analyzer.over_budget == "truncate":
+        memory.update(mode="truncate", truncated_to=round(budget_duration(model, params, budget), 3))
+        return memory
+    if analyzer.over_budget == "chunked":
+        # 전체 PCM(16bit, 파일 페이지)은 유지되므로 남은 예산으로 세그먼트 길이 결정
+        pcm_bytes = 2 * params["sample_rate"] * (duration or 0)
+        segment = min(MAX_SEGMENT, budget_duration(model, params, (budget - pcm_bytes) * CHUNK_HEADROOM))
+        if segment < MIN_SEGMENT:
+            print(f"[Analysis Error] memory budget {budget >> 20} MiB too small for {duration}s input")
+            return None
+        memory.update(mode="chunked", segment_duration=round(segment, 3),
+                      dropped=[opt for opt in CHUNKED_UNSUPPORTED if getattr(analyzer, opt, False)])
+        return memory
+
+    needed = f"~{estimate >> 20} MiB" if estimate is not None else "unknown length"
+    print(f"[Analysis Error] input exceeds memory budget ({duration}s, {needed} > {budget >> 20} MiB)")
+    return None
+
+
+def analyze_chunked(analyzer, file_path, memory, categories=None, features=None, timer=None):
+    """chunked 정책: 세그먼트를 워커 없이 순서대로 분석 (analyze_long, 메모리는 세그먼트 1개 분량)"""
+    # prosody_segment가 prosody_engine을 import하므로 여기서 import
+    from prosody_segment import analyze_segmented
+    result = analyze_segmented(analyzer, file_path, segment_duration=memory["segment_duration"], workers=1,
+                               categories=categories, features=features, timer=timer)
+    return analyzer._with_timings(result, timer)
+
+
+def with_memory(result, memory, peak):
+    """결과 metadata["memory"]에 허용 검사 결과 + 최대 RSS 기록"""
+    if result is None:
+        return None
+    memory.update(peak.report())
+    result["metadata"]["memory"] = memory
+    return result
+
+
+def admit(analyzer, file_path, categories=None, features=None, timer=None):
+    """
+    memory_budget이 설정된 analyze: 길이 확인 -> 예상 메모리 계산 -> 예산 안이면 그대로, 넘으면 정책 적용
+    결과 metadata["memory"]: 길이 / 예상 메모리 / 예산 / 처리 방식(mode) / 최대 RSS
+    """
+    info = timed(timer, "probe", lambda: probe_media(file_path),
+                 lambda i: {"duration": i["duration"] or 0, "prober": i["prober"]})
+    memory = admission_plan(analyzer, file_path, info)
+    if memory is None:
+        return None
+
+    with PeakMemory() as peak:
+        if memory["mode"] == "chunked":
+            result = analyze_chunked(analyzer, file_path, memory, categories, features, timer)
+        else:
+            result = analyzer._analyze_file(file_path, categories, features, timer,
+                                            max_duration=memory.get("truncated_to"))
+    return with_memory(result, memory, peak)
@@ -0,0 +1,108 @@
+import os
+import time
+import asyncio
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+
+from prosody_admission import PeakMemory, admission_plan, analyze_chunked, with_memory
+from prosody_audio import decode_pcm_async, pcm_to_sound, probe_media
+
+
+def _analyze_pcm(analyzer, pcm_bytes, sample_rate, timer=None, memory=None):
+    """
+    executor에서 실행되는 Praat 분석 단계 (ProcessPoolExecutor에서도 pickle 가능한 인자만 사용)
+    memory: 허용 검사 결과 (memory_budget 설정 시) -> 분석 중 최대 RSS와 함께 metadata["memory"]에 기록
+    """
+    if memory is None:
+        sound = pcm_to_sound(pcm_bytes, sample_rate)
+        return analyzer._analyze_sound(sound, timer=timer) if sound is not None else None
+    with PeakMemory() as peak:
+        result = _analyze_pcm(analyzer, pcm_bytes, sample_rate, timer)
+    return with_memory(result, memory, peak)
+
+
+def _analyze_chunked(analyzer, file_path, memory, timer=None):
+    """executor에서 실행되는 chunked 정책 분석 (세그먼트를 순서대로 분석)"""
+    with PeakMemory() as peak:
+        result = analyze_chunked(analyzer, file_path, memory, timer=timer)
+    return with_memory(result, memory, peak)
+
+
+class AsyncRunner:
+    """
+    asyncio 환경용 분석 실행기
+    - 디코딩: 분석 형식 WAV는 memory-map, 그 외 FFmpeg asyncio subprocess (이벤트 루프 비차단), max_decodes개까지 동시 실행
+    - Praat 분석: executor에서 실행 (None이면 루프 기본 ThreadPoolExecutor), max_extractions개까지 동시 실행
+    - 대기 중인 요청은 세마포어에서 기다릴 뿐 스레드를 점유하지 않음
+    """
+
+    def __init__(self, executor=None, max_decodes=8, max_extractions=None):
+        self.executor = executor
+        self.decode_sem = asyncio.Semaphore(max_decodes)
+        self.extract_sem = asyncio.Semaphore(max_extractions or os.cpu_count() or 1)
+
+    async def analyze(self, analyzer, file_path, sample_rate=None):
+        """
+        analyze()의 비동기 버전 - 실패 시 None (task 취소 시 FFmpeg 자식 프로세스도 종료)
+        - memory_budget: 디코딩 전 길이 확인(executor) 후 analyze()와 같은 정책 적용
+        - cache: Feature hit면 점수만 계산, PCM hit면 FFmpeg 생략 (조회 / 저장은 스레드에서 실행)
+        """
+        sample_rate = sample_rate or analyzer.engine_params["sample_rate"]
+        timer = analyzer._new_timer()
+        loop = asyncio.get_running_loop()
+
+        memory = None
+        if analyzer.memory_budget is not None:
+            t = time.perf_counter()
+            info = await loop.run_in_executor(self.executor, probe_media, file_path)
+            if timer is not None and info is not None:
+                timer.record("probe", time.perf_counter() - t, duration=info["duration"] or 0, prober=info["prober"])
+            memory = admission_plan(analyzer, file_path, info)
+            if memory is None:
+                return None
+            if memory["mode"] == "chunked":
+                async with self.extract_sem:
+                    return await loop.run_in_executor(self.executor, _analyze_chunked,
+                                                      analyzer, file_path, memory, timer)
+
+        # 앞부분만 분석하는 truncate 결과는 캐시에 넣지 않음
+        cache = analyzer.cache if memory is None or memory["mode"] == "full" else None
+        state, pcm, decoder = None, None, "cache"
+        if cache is not None:
+            result, state = await loop.run_in_executor(None, cache.lookup, analyzer, file_path, None, None,
+                                                       sample_rate, timer)
+            if state is None:
+                return result
+            pcm = state["pcm"]
+
+        if pcm is None:
+            async with self.decode_sem:
+                t = time.perf_counter()
+                pcm, decoder = await decode_pcm_async(file_path, sample_rate,
+                                                      memory.get("truncated_to") if memory else None)
+            if not pcm:
+                return None
+            if timer is not None:
+                timer.record("decode", time.perf_counter() - t, duration=len(pcm) / 2 / sample_rate, decoder=decoder)
+        if isinstance(self.executor, ProcessPoolExecutor):
+            pcm = bytes(pcm)   # memory-map(memoryview)은 pickle 불가
+
+        async with self.extract_sem:
+            # 이미 시작된 executor 작업은 취소되지 않으며, 결과만 버려짐
+            result = await loop.run_in_executor(self.executor, _analyze_pcm, analyzer, pcm, sample_rate, timer, memory)
+        if cache is not None:
+            await loop.run_in_executor(None, cache.store, state, result, pcm, decoder)
+        return result
+
+
+# 이벤트 루프별 공용 AsyncRunner (세마포어는 생성된 루프에 묶이므로 루프마다 따로 생성, 루프가 사라지면 함께 해제)
+_default_runners = weakref.WeakKeyDictionary()
+
+
+def default_runner():
+    """실행 중인 이벤트 루프의 공용 AsyncRunner (analyze_async에 runner를 지정하지 않은 경우 사용)"""
+    loop = asyncio.get_running_loop()
+    runner = _default_runners.get(loop)
+    if runner is None:
+        runner = _default_runners[loop] = AsyncRunner()
+    return runner
@@ -0,0 +1,314 @@
+import os
+import re
+import json
+import mmap
+import shutil
+import struct
+import subprocess
+import tempfile
+from functools import lru_cache
+
+import numpy as np
+import parselmouth
+
+# 분석 기준 샘플레이트 (16kHz Mono)
+SAMPLE_RATE = 16000
+
+# 폴더 입력 시 분석 대상으로 고르는 확장자
+MEDIA_EXTENSIONS = (".wav", ".mp3", ".m4a", ".mp4", ".webm", ".flac", ".ogg")
+
+
+def media_files(paths):
+    """파일 / 폴더 목록 -> 미디어 파일 목록 (폴더는 MEDIA_EXTENSIONS 파일만, 이름순)"""
+    out = []
+    for path in paths:
+        if os.path.isdir(path):
+            out += sorted(os.path.join(path, f) for f in os.listdir(path) if f.lower().endswith(MEDIA_EXTENSIONS))
+        else:
+            out.append(path)
+    return out
+
+
+def pcm_to_sound(pcm_bytes, sample_rate=SAMPLE_RATE):
+    """16bit PCM(little-endian) 바이트를 parselmouth.Sound로 변환"""
+    samples = np.frombuffer(pcm_bytes, dtype="<i2")
+    if samples.size == 0:
+        return None
+    # WAV 파일 로드와 동일한 스케일 (int16 / 32768) -> 결과 동일성 보장
+    return parselmouth.Sound(samples / 32768.0, sampling_frequency=sample_rate)
+
+
+@lru_cache(maxsize=None)
+def ffmpeg_binary():
+    """
+    FFmpeg 실행 파일 경로 (처음 FFmpeg가 필요할 때 1회만 확인)
+    PATH에 없으면 static_ffmpeg(설치된 경우)로 경로 추가 후 다시 확인
+    """
+    path = shutil.which("ffmpeg")
+    if path is None:
+        try:
+            import static_ffmpeg
+            static_ffmpeg.add_paths()
+            path = shutil.which("ffmpeg")
+        except ImportError:
+            pass
+    return path or "ffmpeg"
+
+
+@lru_cache(maxsize=None)
+def ffprobe_binary():
+    """FFprobe 실행 파일 경로 (PATH 또는 FFmpeg와 같은 폴더), 없으면 None"""
+    path = shutil.which("ffprobe")
+    if path is None:
+        ffmpeg = shutil.which(ffmpeg_binary())
+        if ffmpeg is not None:
+            path = shutil.which("ffprobe", path=os.path.dirname(ffmpeg))
+    return path
+
+
+def _ffmpeg_cmd(input_path, sample_rate, max_duration=None):
+    """16kHz Mono 16bit raw PCM을 stdout으로 출력하는 FFmpeg 명령 (max_duration: 앞부분 N초만 디코딩)"""
+    limit = ["-t", str(max_duration)] if max_duration is not None else []
+    return [
+        ffmpeg_binary(), "-nostdin", "-i", input_path, *limit,
+        "-ar", str(sample_rate), "-ac", "1", "-vn",
+        "-f", "s16le", "-acodec", "pcm_s16le", "pipe:1"
+    ]
+
+
+def wav_header(input_path):
+    """
+    WAV 헤더만 읽어 (format tag, 채널 수, 샘플레이트, block align, 비트 수, data 시작 위치, data 바이트 수), WAV가 아니면 None
+    - WAVE_FORMAT_EXTENSIBLE은 SubFormat의 format tag로 변환, fmt / data 외 청크는 건너뜀
+    """
+    try:
+        with open(input_path, "rb") as f:
+            header = f.read(12)
+            if len(header) < 12 or header[:4] != b"RIFF" or header[8:12] != b"WAVE":
+                return None
+            fmt = None
+            while True:
+                chunk = f.read(8)
+                if len(chunk) < 8:
+                    return None
+                chunk_id, size = chunk[:4], struct.unpack("<I", chunk[4:])[0]
+                if chunk_id == b"fmt ":
+                    fmt = f.read(size)
+                    if size % 2:
+                        f.seek(1, 1)
+                elif chunk_id == b"data":
+                    offset = f.tell()
+                    file_size = f.seek(0, 2)
+                    break
+                else:
+                    f.seek(size + size % 2, 1)
+    except OSError:
+        return None
+
+    if fmt is None or len(fmt) < 16:
+        return None
+    tag, channels, rate, _, block_align, bits = struct.unpack("<HHIIHH", fmt[:16])
+    if tag == 0xFFFE and len(fmt) >= 26:
+        tag = struct.unpack("<H", fmt[24:26])[0]   # EXTENSIBLE: SubFormat GUID 앞 2바이트
+    # 스트리밍 녹음기가 남긴 data 크기(0 / 0xFFFFFFFF)는 파일 끝까지로 보정
+    size = min(size, file_size - offset) if 0 < size < 0xFFFFFFFF else file_size - offset
+    return tag, channels, rate, block_align, bits, offset, size
+
+
+def wav_pcm_layout(input_path, sample_rate=SAMPLE_RATE):
+    """WAV 헤더만 읽어 분석 형식(sample_rate, Mono, 16bit PCM)과 같으면 (data 시작 위치, 바이트 수), 아니면 None"""
+    header = wav_header(input_path)
+    if header is None or header[:5] != (1, 1, sample_rate, 2, 16):
+        return None
+    offset, size = header[5:]
+    return offset, size - size % 2
+
+
+def decode_wav_pcm(input_path, sample_rate=SAMPLE_RATE):
+    """
+    분석 형식과 같은 WAV의 PCM data 청크를 memory-map으로 반환 (복사 없음, FFmpeg 프로세스 없음)
+    형식이 다르면 None -> 다음 디코더(FFmpeg)로 넘어감
+    """
+    layout = wav_pcm_layout(input_path, sample_rate)
+    if layout is None:
+        return None
+    offset, size = layout
+    if size == 0:
+        return b""
+    with open(input_path, "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return memoryview(mm)[offset:offset + size]
+
+
+def decode_ffmpeg_pcm(input_path, sample_rate=SAMPLE_RATE, max_duration=None):
+    """FFmpeg로 디코딩한 16bit Mono raw PCM 바이트 반환 (실패 시 None)"""
+    try:
+        proc = subprocess.run(_ffmpeg_cmd(input_path, sample_rate, max_duration),
+                              stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return proc.stdout
+
+
+def decode_ffmpeg_pcm_file(input_path, sample_rate=SAMPLE_RATE, max_duration=None):
+    """
+    FFmpeg 출력을 임시 파일에 쓴 뒤 memory-map으로 반환 (실패 시 None)
+    - 긴 녹음용: PCM이 프로세스 힙 대신 파일 페이지에 있음 (메모리 부족 시 OS가 회수 가능)
+    """
+    with tempfile.TemporaryFile() as f:
+        try:
+            subprocess.run(_ffmpeg_cmd(input_path, sample_rate, max_duration),
+                           stdout=f, stderr=subprocess.DEVNULL, check=True)
+        except (OSError, subprocess.CalledProcessError):
+            return None
+        size = f.seek(0, 2)
+        if size < 2:
+            return b""
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return memoryview(mm)[:size - size % 2]
+
+
+# ==========================================
+# 입력 확인 (디코딩 전 길이 / 스트림 구성)
+# ==========================================
+def probe_media(input_path):
+    """
+    디코딩 없이 길이와 오디오 스트림 구성 확인 (실패 시 None)
+    반환: {"duration": 초 (알 수 없으면 None), "audio": [{"codec", "channels", "sample_rate"}...], "video": bool, "prober": ...}
+    - WAV는 헤더만 읽음, 그 외 FFprobe (없으면 FFmpeg 입력 정보 출력을 파싱)
+    """
+    header = wav_header(input_path)
+    if header is not None and header[2] > 0 and header[3] > 0:
+        tag, channels, rate, block_align, bits, _, size = header
+        return {"duration": size // block_align / rate, "video": False, "prober": "wav",
+                "audio": [{"codec": f"wav:{tag}:{bits}bit", "channels": channels, "sample_rate": rate}]}
+    if ffprobe_binary() is not None:
+        return _probe_ffprobe(input_path)
+    return _probe_ffmpeg(input_path)
+
+
+def _probe_ffprobe(input_path):
+    cmd = [ffprobe_binary(), "-v", "error", "-of", "json",
+           "-show_entries", "format=duration:stream=codec_type,codec_name,channels,sample_rate", input_path]
+    try:
+        proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, check=True)
+        info = json.loads(proc.stdout)
+    except (OSError, subprocess.CalledProcessError, ValueError):
+        return None
+    streams = info.get("streams", [])
+    try:
+        duration = float(info.get("format", {}).get("duration"))
+    except (TypeError, ValueError):
+        duration = None
+    audio = [{"codec": st.get("codec_name"), "channels": st.get("channels"),
+              "sample_rate": int(st["sample_rate"]) if st.get("sample_rate") else None}
+             for st in streams if st.get("codec_type") == "audio"]
+    return {"duration": duration, "audio": audio, "prober": "ffprobe",
+            "video": any(st.get("codec_type") == "video" for st in streams)}
+
+
+# FFmpeg 입력 정보 예: "Duration: 01:58:03.52, ..." / "Stream #0:1(und): Audio: aac (LC) (mp4a / 0x6134706D), 48000 Hz, stereo, fltp"
+_DURATION_RE = re.compile(r"Duration: (\d+):(\d+):(\d+(?:\.\d+)?)")
+_STREAM_RE = re.compile(r"Stream #\S+: (Audio|Video): (\w+)([^\n]*)")
+_LAYOUTS = {"mono": 1, "stereo": 2}
+
+
+def _probe_ffmpeg(input_path):
+    """FFprobe가 없을 때: 출력 없이 실행한 FFmpeg의 입력 정보(stderr) 파싱"""
+    try:
+        proc = subprocess.run([ffmpeg_binary(), "-nostdin", "-hide_banner", "-i", input_path],
+                              stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    except OSError:
+        return None
+    text = proc.stderr.decode("utf-8", "replace")
+    if "Input #0" not in text:
+        return None
+    m = _DURATION_RE.search(text)
+    duration = int(m.group(1)) * 3600 + int(m.group(2)) * 60 + float(m.group(3)) if m else None
+    audio, video = [], False
+    for kind, codec, rest in _STREAM_RE.findall(text):
+        if kind == "Video":
+            video = True
+            continue
+        rate = re.search(r"(\d+) Hz", rest)
+        layout = re.search(r"Hz, ([^,(]+)", rest)
+        layout = layout.group(1).strip() if layout else ""
+        channels = _LAYOUTS.get(layout) or (int(layout.split()[0]) if layout.endswith("channels") else None)
+        audio.append({"codec": codec, "channels": channels, "sample_rate": int(rate.group(1)) if rate else None})
+    return {"duration": duration, "audio": audio, "video": video, "prober": "ffmpeg"}
+
+
+# ==========================================
+# 디코더 목록 (앞에서부터 시도, PCM 바이트를 반환한 첫 디코더 사용)
+# ==========================================
+# - 디코더: fn(input_path, sample_rate) -> 16bit Mono PCM (bytes / memoryview) 또는 None(처리 불가)
+# - FFmpeg는 항상 마지막 (MP4 / M4A / MP3 등 나머지 형식)
+DECODERS = [("wav", decode_wav_pcm)]
+
+
+def register_decoder(name, fn, index=0):
+    """디코더 추가 (기본: 가장 먼저 시도)"""
+    DECODERS.insert(index, (name, fn))
+
+
+def decode_pcm(input_path, sample_rate=SAMPLE_RATE, max_duration=None, spill=False):
+    """
+    (PCM, 사용한 디코더 이름) - 실패 시 (None, "ffmpeg")
+    max_duration: 앞부분 N초만 반환, spill: FFmpeg 출력을 임시 파일 memory-map으로 받음 (긴 녹음용)
+    """
+    for name, fn in DECODERS:
+        pcm = fn(input_path, sample_rate)
+        if pcm is not None:
+            if max_duration is not None:
+                pcm = pcm[:int(max_duration * sample_rate) * 2]
+            return pcm, name
+    decode = decode_ffmpeg_pcm_file if spill else decode_ffmpeg_pcm
+    return decode(input_path, sample_rate, max_duration), "ffmpeg"
+
+
+def decode_sound(input_path, sample_rate=SAMPLE_RATE, max_duration=None):
+    """(Sound, 사용한 디코더 이름) - 실패 시 Sound는 None"""
+    pcm, decoder = decode_pcm(input_path, sample_rate, max_duration)
+    if pcm is None:
+        return None, decoder
+    return pcm_to_sound(pcm, sample_rate), decoder
+
+
+async def decode_pcm_async(input_path, sample_rate=SAMPLE_RATE, max_duration=None):
+    """decode_pcm의 비동기 버전 - 헤더 확인 / memory-map 디코더는 바로 실행, FFmpeg만 subprocess 대기"""
+    for name, fn in DECODERS:
+        pcm = fn(input_path, sample_rate)
+        if pcm is not None:
+            if max_duration is not None:
+                pcm = pcm[:int(max_duration * sample_rate) * 2]
+            return pcm, name
+    return await decode_ffmpeg_pcm_async(input_path, sample_rate, max_duration), "ffmpeg"
+
+
+async def decode_ffmpeg_pcm_async(input_path, sample_rate=SAMPLE_RATE, max_duration=None):
+    """
+    asyncio subprocess로 FFmpeg 실행 후 raw PCM 바이트 반환 (실패 시 None)
+    - 이벤트 루프를 막지 않음
+    - 호출 task가 취소되면 FFmpeg 자식 프로세스를 kill
+    """
+    import asyncio   # asyncio 환경에서만 import (동기 analyze 시작 비용 제외)
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            *_ffmpeg_cmd(input_path, sample_rate, max_duration),
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+    except OSError:
+        return None
+
+    try:
+        pcm, _ = await proc.communicate()
+    except asyncio.CancelledError:
+        if proc.returncode is None:
+            proc.kill()
+        await proc.wait()
+        raise
+    if proc.returncode != 0:
+        return None
+    return pcm
@@ -0,0 +1,237 @@
+import os
+import sys
+import csv
+import json
+import argparse
+
+import numpy as np
+
+from prosody_profiles import PRESETS, make_analyzer, resolve_profile
+from prosody_scoring import GENDER_PITCH_THRESHOLD
+
+GENDERS = ("male", "female")
+
+
+# ==========================================
+# 스트리밍 통계 (개수, 평균, 편차 제곱합 M2)
+# ==========================================
+def welford(stats, x):
+    """Welford 갱신 - 값 1개 추가"""
+    n, mean, m2 = stats
+    n += 1
+    delta = x - mean
+    mean += delta / n
+    return (n, mean, m2 + delta * (x - mean))
+
+
+def merge_stats(a, b):
+    """Chan 병렬 분산 공식으로 두 통계 병합 (샤드별 결과 합치기)"""
+    n = a[0] + b[0]
+    if a[0] == 0 or b[0] == 0:
+        return a if b[0] == 0 else b
+    delta = b[1] - a[1]
+    return (n, a[1] + delta * b[0] / n, a[2] + b[2] + delta * delta * a[0] * b[0] / n)
+
+
+def _mean_std(stats):
+    n, mean, m2 = stats
+    return {"mean": round(mean, 4), "std": round(float(np.sqrt(m2 / n)), 4) if n > 0 else 0.0}
+
+
+def crossing_threshold(male, female):
+    """남/여 mean pitch 분포의 Z-Score가 같아지는 피치 (성별 감지 기준)"""
+    m, f = _mean_std(male), _mean_std(female)
+    if m["std"] + f["std"] == 0:
+        return (m["mean"] + f["mean"]) / 2
+    return (m["mean"] * f["std"] + f["mean"] * m["std"]) / (m["std"] + f["std"])
+
+
+# ==========================================
+# 진행 기록 (JSONL, 파일 1개당 1줄 -> 중단 후 재개)
+# ==========================================
+def read_log(log_path):
+    """{path: raw_features 또는 None(실패)} - 마지막 줄이 잘려 있으면 잘라내고 무시"""
+    records = {}
+    if not os.path.exists(log_path):
+        return records
+    with open(log_path, "rb+") as f:
+        data = f.read()
+        end = data.rfind(b"\n") + 1
+        if end < len(data):
+            f.truncate(end)
+    for line in data[:end].splitlines():
+        entry = json.loads(line)
+        records[entry["path"]] = entry.get("raw_features")
+    return records
+
+
+def read_labels(csv_path):
+    """path,gender CSV (gender: Male / Female / M / F) -> {path: "male" / "female"}"""
+    labels = {}
+    with open(csv_path, newline="") as f:
+        for row in csv.reader(f):
+            if len(row) >= 2 and row[1].strip()[:1].upper() in ("M", "F"):
+                labels[row[0]] = "male" if row[1].strip()[:1].upper() == "M" else "female"
+    return labels
+
+
+def extract(analyzer, paths, log_path, workers=None, timeout=None):
+    """
+    paths 중 log에 없는 파일만 analyze_many로 병렬 분석하여 raw_features를 log에 추가
+    - 1줄씩 바로 기록 -> 중단(크래시, Ctrl+C) 후 같은 log로 다시 실행하면 이어서 진행
+    - 실패한 파일도 기록하여 재실행 시 다시 시도하지 않음
+    반환: (새로 분석한 파일 수, 실패 수)
+    """
+    done = read_log(log_path)
+    todo = (p for p in paths if p not in done)
+    n_new = n_failed = 0
+    with open(log_path, "a") as f:
+        for path, res in analyzer.analyze_many(todo, workers=workers, timeout=timeout):
+            if isinstance(res, dict):
+                entry = {"path": path, "raw_features": {k: float(v) for k, v in res["raw_features"].items()}}
+            else:
+                entry = {"path": path, "error": str(res)}
+                n_failed += 1
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+            n_new += 1
+            if n_new % 100 == 0:
+                print(f"[baseline] {len(done) + n_new} files ({n_failed} failed)")
+    return n_new, n_failed
+
+
+# ==========================================
+# 기준 분포 계산
+# ==========================================
+def _genders(records, labels, threshold):
+    for path, raw in records.items():
+        if raw is None:
+            continue
+        gender = labels.get(path) if labels else None
+        if gender is None:
+            gender = "male" if raw["mean pitch"] < threshold else "female"
+        yield gender, raw
+
+
+def build_baseline(records, labels=None, threshold=GENDER_PITCH_THRESHOLD, max_iter=20, profile=None):
+    """
+    raw_features 기록 -> 성별 기준 분포 (Feature별 Welford 통계)
+    - 성별: labels(path -> male / female)에 있으면 사용, 없으면 mean pitch와 threshold 비교
+    - threshold는 남/여 mean pitch 분포가 만나는 지점으로 다시 계산
+      (라벨 없는 파일이 있으면 새 기준으로 다시 나누어 수렴할 때까지 반복, max_iter=0이면 threshold 고정)
+    """
+    records = {p: r for p, r in records.items() if r is not None}
+    unlabeled = any(p not in (labels or {}) for p in records)
+    for _ in range(max_iter if unlabeled else min(max_iter, 1)):
+        pitch = {g: (0, 0.0, 0.0) for g in GENDERS}
+        for gender, raw in _genders(records, labels, threshold):
+            pitch[gender] = welford(pitch[gender], raw["mean pitch"])
+        if pitch["male"][0] == 0 or pitch["female"][0] == 0:
+            break
+        new = round(crossing_threshold(pitch["male"], pitch["female"]), 2)
+        if new == threshold:
+            break
+        threshold = new
+
+    stats = {g: {} for g in GENDERS}
+    for gender, raw in _genders(records, labels, threshold):
+        for feat, val in raw.items():
+            stats[gender][feat] = welford(stats[gender].get(feat, (0, 0.0, 0.0)), val)
+    return _baseline_doc(stats, threshold, profile)
+
+
+def _baseline_doc(stats, threshold, profile):
+    doc = {"gender_threshold": threshold, "profile": profile,
+           "counts": {g: max((s[0] for s in stats[g].values()), default=0) for g in GENDERS}}
+    for g in GENDERS:
+        doc[g] = {feat: _mean_std(s) for feat, s in sorted(stats[g].items())}
+    # 샤드 병합용 원본 통계 (n, mean, M2)
+    doc["stats"] = {g: {feat: list(s) for feat, s in sorted(stats[g].items())} for g in GENDERS}
+    return doc
+
+
+def merge_baselines(docs):
+    """
+    여러 샤드의 기준 분포 파일 병합 (stats 병합)
+    - 모든 샤드가 같은 gender_threshold로 성별을 나눈 경우만 가능 (run --fixed-threshold), threshold는 그대로 유지
+    - threshold를 다시 계산하려면 샤드 기록(--log)을 합쳐 build로 성별을 다시 나누어야 함
+    """
+    thresholds = {doc["gender_threshold"] for doc in docs}
+    if len(thresholds) != 1:
+        raise ValueError(f"shards use different gender thresholds {sorted(thresholds)} "
+                         "(run shards with --fixed-threshold, or rebuild from their logs)")
+    stats = {g: {} for g in GENDERS}
+    for doc in docs:
+        for g in GENDERS:
+            for feat, s in doc["stats"][g].items():
+                stats[g][feat] = merge_stats(stats[g].get(feat, (0, 0.0, 0.0)), tuple(s))
+    return _baseline_doc(stats, thresholds.pop(), docs[0].get("profile"))
+
+
+def load_baseline(path):
+    """기준 분포 파일 -> {"male": {...}, "female": {...}, "gender_threshold": ...}"""
+    with open(path) as f:
+        return json.load(f)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="코퍼스 기준 분포(baseline_male / baseline_female) 재계산")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_run = sub.add_parser("run", help="코퍼스 분석 (중단 시 같은 --log로 재실행하면 이어서 진행) 후 기준 분포 저장")
+    p_run.add_argument("paths", nargs="+", help="분석할 파일 또는 폴더")
+    p_run.add_argument("--preset", choices=list(PRESETS), default="full")
+    p_run.add_argument("--profile", help="분석 프로파일 (기본: 분석기 기본값)")
+    p_run.add_argument("--log", default="baseline_log.jsonl", help="진행 기록 (파일별 raw_features)")
+    p_run.add_argument("--labels", help="path,gender CSV (없으면 mean pitch로 성별 판정)")
+    p_run.add_argument("--threshold", type=float, default=GENDER_PITCH_THRESHOLD, help="초기 성별 기준 피치")
+    p_run.add_argument("--fixed-threshold", action="store_true",
+                       help="성별 기준 피치를 다시 계산하지 않음 (샤드별 실행 후 merge할 때 사용)")
+    p_run.add_argument("--workers", type=int)
+    p_run.add_argument("--timeout", type=float)
+    p_run.add_argument("--out", default="baseline.json")
+
+    p_merge = sub.add_parser("merge", help="여러 샤드의 기준 분포 파일 병합 (같은 기준 피치로 나눈 샤드만)")
+    p_merge.add_argument("files", nargs="+")
+    p_merge.add_argument("--out", default="baseline.json")
+
+    p_build = sub.add_parser("build", help="샤드 진행 기록(--log)을 합쳐 기준 분포 계산 (기준 피치 재계산 포함)")
+    p_build.add_argument("logs", nargs="+")
+    p_build.add_argument("--labels", help="path,gender CSV (없으면 mean pitch로 성별 판정)")
+    p_build.add_argument("--threshold", type=float, default=GENDER_PITCH_THRESHOLD, help="초기 성별 기준 피치")
+    p_build.add_argument("--profile", help="분석 프로파일 이름 (출력 파일 기록용)")
+    p_build.add_argument("--out", default="baseline.json")
+
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        from prosody_audio import media_files
+        analyzer = make_analyzer(args.preset, profile=args.profile)
+        n_new, n_failed = extract(analyzer, media_files(args.paths), args.log,
+                                  workers=args.workers, timeout=args.timeout)
+        print(f"[baseline] analyzed {n_new} new files ({n_failed} failed)")
+        labels = read_labels(args.labels) if args.labels else None
+        doc = build_baseline(read_log(args.log), labels, args.threshold, profile=analyzer.engine_params,
+                             max_iter=0 if args.fixed_threshold else 20)
+    elif args.command == "build":
+        records = {}
+        for log in args.logs:
+            records.update(read_log(log))
+        labels = read_labels(args.labels) if args.labels else None
+        profile = resolve_profile(args.profile) if args.profile else None
+        doc = build_baseline(records, labels, args.threshold, profile=profile)
+    else:
+        try:
+            doc = merge_baselines([load_baseline(p) for p in args.files])
+        except ValueError as e:
+            print(f"[baseline] {e}")
+            return 1
+
+    with open(args.out, "w") as f:
+        json.dump(doc, f, indent=2, ensure_ascii=False)
+    print(f"[baseline] {args.out}: male {doc['counts']['male']} / female {doc['counts']['female']}, "
+          f"gender threshold {doc['gender_threshold']} Hz")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+import os
+import time
+import multiprocessing as mp
+from multiprocessing import connection
+
+
+class AnalysisError(Exception):
+    """배치 분석에서 개별 파일 분석 실패 (analyze가 None 반환, 예외, 워커 비정상 종료)"""
+
+
+def _worker_main(analyzer, conn):
+    """워커 프로세스: 전용 Pipe로 파일 경로를 하나씩 받아 analyze 실행 후 같은 Pipe로 결과 전달"""
+    while True:
+        try:
+            item = conn.recv()
+        except EOFError:
+            break
+        if item is None:
+            break
+        path = item
+        try:
+            res = analyzer.analyze(path)
+            err = None if res is not None else "analysis failed"
+        except Exception as e:
+            res, err = None, f"{type(e).__name__}: {e}"
+        conn.send((res, err))
+
+
+class _Worker:
+    """
+    워커 프로세스 1개 + 전용 Pipe + 현재 처리 중인 작업 정보
+    (워커끼리 큐 / lock을 공유하지 않으므로 timeout으로 terminate해도 다른 워커의 결과 전달에 영향 없음)
+    """
+
+    def __init__(self, ctx, analyzer):
+        self.conn, child_conn = ctx.Pipe()
+        self.proc = ctx.Process(target=_worker_main, args=(analyzer, child_conn), daemon=True)
+        self.proc.start()
+        child_conn.close()   # 워커가 종료되면 recv가 EOFError
+        self.path = None
+        self.started = None
+
+    def submit(self, path):
+        self.path = path
+        self.started = time.monotonic()
+        self.conn.send(path)
+
+    def finish(self):
+        path, self.path, self.started = self.path, None, None
+        return path
+
+    def stop(self):
+        if self.proc.is_alive():
+            try:
+                self.conn.send(None)
+            except OSError:
+                pass
+
+    def kill(self):
+        if self.proc.is_alive():
+            self.proc.terminate()
+        self.proc.join()
+        self.conn.close()
+
+
+def run_batch(analyzer, paths, workers=None, timeout=None, poll_interval=0.1):
+    """
+    여러 파일을 프로세스 풀로 병렬 분석하고, 끝나는 순서대로 (path, 결과 또는 에러) yield
+    - 워커당 1개 작업만 할당 -> 동시 처리량이 workers로 제한되어 대량 배치에서도 메모리 일정
+    - paths는 generator도 가능 (필요한 만큼만 꺼내 씀)
+    - timeout(초) 초과 시 해당 워커를 종료/재생성하고 TimeoutError 반환
+    - 분석 실패/워커 크래시는 AnalysisError로 반환되며 나머지 배치는 계속 진행
+    """
+    workers = workers or os.cpu_count() or 1
+    ctx = mp.get_context()
+    pool = [_Worker(ctx, analyzer) for _ in range(workers)]
+    path_iter = iter(paths)
+    exhausted = False
+
+    def respawn(worker):
+        worker.kill()
+        new = _Worker(ctx, analyzer)
+        pool[pool.index(worker)] = new
+        return new
+
+    try:
+        while True:
+            # [1] 유휴 워커에 다음 파일 할당
+            for w in pool:
+                if w.path is None and not exhausted:
+                    try:
+                        w.submit(next(path_iter))
+                    except StopIteration:
+                        exhausted = True
+            busy = [w for w in pool if w.path is not None]
+            if not busy:
+                break
+
+            # [2] 결과 대기 (가장 가까운 timeout 시점까지만) - 워커별 Pipe와 프로세스 종료(sentinel)를 함께 대기
+            wait = poll_interval
+            if timeout is not None:
+                now = time.monotonic()
+                wait = min(wait, max(0.0, min(w.started + timeout for w in busy) - now))
+            ready = connection.wait([w.conn for w in busy] + [w.proc.sentinel for w in busy], timeout=wait)
+            for w in busy:
+                if w.conn not in ready:
+                    continue
+                try:
+                    res, err = w.conn.recv()
+                except EOFError:
+                    # 결과 전송 전에 종료된 워커 -> [3]에서 정리
+                    w.proc.join()
+                    continue
+                path = w.finish()
+                yield path, (res if err is None else AnalysisError(f"{path}: {err}"))
+
+            # [3] timeout 초과 / 비정상 종료된 워커 정리
+            now = time.monotonic()
+            for w in list(pool):
+                if w.path is None:
+                    continue
+                if timeout is not None and now - w.started > timeout:
+                    path = w.finish()
+                    respawn(w)
+                    yield path, TimeoutError(f"{path}: exceeded {timeout}s")
+                elif not w.proc.is_alive():
+                    path = w.finish()
+                    code = w.proc.exitcode
+                    respawn(w)
+                    yield path, AnalysisError(f"{path}: worker exited with code {code}")
+    finally:
+        for w in pool:
+            w.stop()
+        for w in pool:
+            w.proc.join(timeout=1.0)
+            w.kill()
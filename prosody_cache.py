@@ -0,0 +1,223 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+
+from prosody_audio import decode_pcm, pcm_to_sound
+from prosody_timing import timed
+
+# 캐시 네임스페이스
+FEATURES = "features"   # raw_features (JSON) - 미디어 해시 + 분석기 변형/파라미터 기준
+PCM = "pcm"             # 디코딩된 16bit PCM - 미디어 해시 + 샘플레이트 기준 (Feature 파라미터와 무관)
+
+
+def media_hash(path, chunk_size=1 << 20):
+    """미디어 파일 내용 기반 해시 (파일명/경로와 무관 -> 같은 녹음 재업로드 시 동일 키)"""
+    h = hashlib.blake2b(digest_size=20)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(chunk_size), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+class AnalysisCache:
+    """
+    analyze 앞단의 content-addressed 캐시 (메모리 LRU + sqlite 디스크 2단)
+
+    - Feature 캐시 hit: FFmpeg/Praat 모두 생략, 현재 가중치/기준 분포로 점수만 다시 계산
+    - PCM 캐시 hit: FFmpeg 디코딩만 생략 (분석 파라미터가 바뀐 경우)
+    - 디스크 tier는 WAL 모드 sqlite -> 여러 워커 프로세스가 같은 파일을 공유 가능
+    - 크기(바이트) / TTL(초) 기준 삭제, hit/miss 카운터 제공
+    """
+
+    def __init__(self, path=None, max_memory_bytes=256 << 20, max_disk_bytes=4 << 30, ttl=None):
+        self.path = path
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.ttl = ttl
+        self._memory = OrderedDict()   # (ns, key) -> (value, created)
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self._conn = None
+        self._conn_pid = None
+        self.counters = {ns: {"memory_hits": 0, "disk_hits": 0, "misses": 0} for ns in (FEATURES, PCM)}
+
+    def __getstate__(self):
+        # 프로세스 풀 전달 시 connection / lock은 제외 (각 프로세스에서 새로 생성)
+        state = self.__dict__.copy()
+        state["_conn"] = None
+        state["_conn_pid"] = None
+        state["_lock"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # 저장소
+    # ------------------------------------------------------------------
+    def _db(self):
+        """프로세스별 sqlite connection (fork 이후 재사용 금지)"""
+        if self.path is None:
+            return None
+        if self._conn is None or self._conn_pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                " ns TEXT, key TEXT, value BLOB, size INTEGER, created REAL, accessed REAL,"
+                " PRIMARY KEY (ns, key))"
+            )
+            self._conn, self._conn_pid = conn, os.getpid()
+        return self._conn
+
+    def _expired(self, created, now):
+        return self.ttl is not None and now - created > self.ttl
+
+    def get(self, ns, key):
+        """값(bytes) 반환, 없거나 TTL 만료 시 None"""
+        now = time.time()
+        with self._lock:
+            item = self._memory.get((ns, key))
+            if item is not None:
+                if not self._expired(item[1], now):
+                    self._memory.move_to_end((ns, key))
+                    self.counters[ns]["memory_hits"] += 1
+                    return item[0]
+                self._memory_bytes -= len(item[0])
+                del self._memory[(ns, key)]
+
+            db = self._db()
+            if db is not None:
+                row = db.execute("SELECT value, created FROM cache WHERE ns=? AND key=?", (ns, key)).fetchone()
+                if row is not None:
+                    if not self._expired(row[1], now):
+                        db.execute("UPDATE cache SET accessed=? WHERE ns=? AND key=?", (now, ns, key))
+                        self._remember(ns, key, row[0], row[1])
+                        self.counters[ns]["disk_hits"] += 1
+                        return row[0]
+                    db.execute("DELETE FROM cache WHERE ns=? AND key=?", (ns, key))
+
+            self.counters[ns]["misses"] += 1
+            return None
+
+    def put(self, ns, key, value):
+        now = time.time()
+        with self._lock:
+            self._remember(ns, key, value, now)
+            db = self._db()
+            if db is not None:
+                db.execute("INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?, ?, ?)",
+                           (ns, key, value, len(value), now, now))
+                self._evict_disk(db, now)
+
+    def _remember(self, ns, key, value, created):
+        """메모리 tier에 추가 후 LRU 순서로 용량 초과분 삭제"""
+        old = self._memory.pop((ns, key), None)
+        if old is not None:
+            self._memory_bytes -= len(old[0])
+        if len(value) > self.max_memory_bytes:
+            return
+        self._memory[(ns, key)] = (value, created)
+        self._memory_bytes += len(value)
+        while self._memory_bytes > self.max_memory_bytes:
+            _, (v, _) = self._memory.popitem(last=False)
+            self._memory_bytes -= len(v)
+
+    def _evict_disk(self, db, now):
+        """TTL 만료 항목 삭제 후, 용량 초과 시 오래 사용되지 않은 항목부터 삭제"""
+        if self.ttl is not None:
+            db.execute("DELETE FROM cache WHERE created < ?", (now - self.ttl,))
+        total = db.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0]
+        if total <= self.max_disk_bytes:
+            return
+        excess = total - self.max_disk_bytes
+        victims, freed = [], 0
+        for ns, key, size in db.execute("SELECT ns, key, size FROM cache ORDER BY accessed"):
+            victims.append((ns, key))
+            freed += size
+            if freed >= excess:
+                break
+        db.executemany("DELETE FROM cache WHERE ns=? AND key=?", victims)
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            db = self._db()
+            if db is not None:
+                db.execute("DELETE FROM cache")
+
+    def stats(self):
+        """네임스페이스별 hit/miss 카운터 + 메모리 tier 사용량"""
+        with self._lock:
+            return {
+                **{ns: dict(c) for ns, c in self.counters.items()},
+                "memory_items": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+            }
+
+    # ------------------------------------------------------------------
+    # analyze 연동
+    # ------------------------------------------------------------------
+    def lookup(self, analyzer, file_path, categories=None, features=None, sample_rate=None, timer=None):
+        """
+        analyze 앞단 조회 (동기 / 비동기 analyze 공용)
+        반환: (결과, None) Feature hit / (None, 상태) miss / (None, None) 파일을 읽을 수 없음
+        상태: feature_key / known(저장된 Feature) / pcm_key / pcm(PCM hit이면 바이트, 아니면 None)
+        """
+        sample_rate = sample_rate or analyzer.engine_params["sample_rate"]
+        try:
+            digest = media_hash(file_path)
+        except OSError:
+            return None, None
+
+        needed = analyzer._needed_features(categories, features)
+        if categories is None and features is not None:
+            categories = []
+
+        # 일부 Feature만 계산된 항목은 요청한 Feature를 모두 포함할 때만 hit
+        feature_key = f"{digest}:{analyzer._cache_variant()}"
+        cached = self.get(FEATURES, feature_key)
+        known = json.loads(cached) if cached is not None else {}
+        # 트랙 / 요약 반환이 필요한 분석기는 Feature hit로 처리하지 않음 (PCM 캐시만 사용)
+        if not (analyzer.keep_tracks or analyzer.keep_summary) and all(name in known for name in needed):
+            result = timed(timer, "scoring", lambda: analyzer._score({name: known[name] for name in needed}, categories))
+            return analyzer._with_timings(result, timer), None
+
+        pcm_key = f"{digest}:{sample_rate}"
+        state = {"feature_key": feature_key, "known": known, "pcm_key": pcm_key, "pcm": self.get(PCM, pcm_key)}
+        return None, state
+
+    def store(self, state, result, pcm=None, decoder=None):
+        """miss 후 분석 결과 저장 (FFmpeg로 디코딩한 PCM / raw_features)"""
+        # 분석 형식 WAV는 파일을 직접 읽는 편이 빠르므로 FFmpeg 디코딩 결과만 저장
+        if pcm and decoder == "ffmpeg":
+            self.put(PCM, state["pcm_key"], bytes(pcm))
+        if result is not None:
+            known = dict(state["known"])
+            known.update({k: float(v) for k, v in result["raw_features"].items()})
+            self.put(FEATURES, state["feature_key"], json.dumps(known).encode())
+
+    def analyze(self, analyzer, file_path, categories=None, features=None, sample_rate=None, timer=None):
+        """캐시를 거친 analyze: Feature hit -> 점수만 계산, PCM hit -> FFmpeg 생략"""
+        sample_rate = sample_rate or analyzer.engine_params["sample_rate"]
+        result, state = self.lookup(analyzer, file_path, categories, features, sample_rate, timer)
+        if state is None:
+            return result
+
+        pcm, decoder = state["pcm"], "cache"
+        if pcm is None:
+            pcm, decoder = timed(timer, "decode", lambda: decode_pcm(file_path, sample_rate),
+                                 lambda d: {"duration": len(d[0] or b"") / 2 / sample_rate, "decoder": d[1]})
+            if not pcm:
+                return None
+
+        sound = pcm_to_sound(pcm, sample_rate)
+        result = analyzer._analyze_sound(sound, categories=categories, features=features, timer=timer)
+        self.store(state, result, pcm, decoder)
+        return result
@@ -0,0 +1,48 @@
+import json
+from urllib import request, error
+
+from prosody_server import DEFAULT_HOST, DEFAULT_PORT
+
+
+class ServerBusy(Exception):
+    """분석 서버 대기 큐가 가득 참 - retry_after(초) 후 재시도"""
+
+    def __init__(self, retry_after):
+        super().__init__(f"analysis server busy, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class ProsodyClient:
+    """
+    prosody_server 클라이언트 (analyze()와 같은 인자 / 반환 형태, 분석 실패 시 None)
+    - 파일 경로는 서버와 같은 머신 기준 (파일 내용은 전송하지 않음)
+    - 서버 대기 큐가 가득 차면 ServerBusy, deadline 초과 시 TimeoutError
+    """
+
+    def __init__(self, url=f"http://{DEFAULT_HOST}:{DEFAULT_PORT}", preset="light", timeout=None):
+        self.url = url.rstrip("/")
+        self.preset = preset
+        self.timeout = timeout
+
+    def analyze(self, file_path, categories=None, features=None, timeout=None):
+        timeout = timeout or self.timeout
+        body = json.dumps({"path": file_path, "preset": self.preset, "categories": categories,
+                           "features": features, "timeout": timeout}).encode()
+        req = request.Request(f"{self.url}/analyze", data=body, headers={"Content-Type": "application/json"})
+        try:
+            # HTTP 대기 시간은 서버 deadline보다 약간 길게 (서버가 504로 먼저 응답)
+            with request.urlopen(req, timeout=timeout + 10 if timeout else None) as resp:
+                return json.loads(resp.read())["result"]
+        except error.HTTPError as e:
+            payload = json.loads(e.read() or b"{}")
+            if e.code == 503:
+                raise ServerBusy(payload.get("retry_after", 1)) from None
+            if e.code == 504:
+                raise TimeoutError(f"{file_path}: {payload.get('error')}") from None
+            if e.code == 422:
+                return None
+            raise
+
+    def health(self):
+        with request.urlopen(f"{self.url}/health") as resp:
+            return json.loads(resp.read())
@@ -0,0 +1,620 @@
+import json
+from types import MappingProxyType
+from functools import cached_property
+
+import numpy as np
+import parselmouth
+from parselmouth.praat import call
+
+from prosody_admission import POLICIES, admit
+from prosody_audio import decode_sound
+from prosody_praat import formant_tracks, silence_intervals, silent_durations
+from prosody_profiles import profile_key, resolve_profile
+from prosody_scoring import GENDER_PITCH_THRESHOLD, ScoringTable
+from prosody_timing import StageTimer, timed
+
+# 읽기 전용 가중치 / 기준 분포 테이블별 컴파일된 ScoringTable (ProsodyAnalyzerBase.scoring)
+_SHARED_SCORING = {}
+
+# Peak Normalization 목표 진폭 (-1dB, 10^(-1/20) ≈ 0.89125), 침묵 판정 임계값 (최대 강도 대비 dB)
+# 분할 분석(prosody_segment) / 스트리밍(prosody_stream)도 같은 값 사용
+PEAK_TARGET = 0.89125
+SILENCE_THRESHOLD = -35.0
+
+# Feature 이름 -> 계산 그룹 (같은 그룹의 Feature는 같은 Praat 객체에서 한 번에 계산)
+FEATURE_GROUPS = {
+    "mean pitch": "pitch", "max pitch": "pitch",
+    "intensityMean": "intensity", "intensityMax": "intensity",
+    "diffIntMaxMin": "intensity", "intensitySD": "intensity",
+    "avgBand1": "formant", "avgBand2": "formant", "F1STD": "formant", "f3STD": "formant",
+    "f3meanf1": "formant", "f2meanf1": "formant", "f2STDf1": "formant", "fmean3": "formant",
+    "percentUnvoiced": "unvoiced",
+    "avgDurPause": "pause", "maxDurPause": "pause", "PercentBreaks": "pause",
+    "shimmer": "perturbation", "jitter": "perturbation",
+}
+
+
+# Formant Feature -> (formant_values 키, 통계) - FeatureEngine과 병합 통계(prosody_segment) 공통
+FORMANT_FEATURES = {
+    "avgBand1": ("band1", "mean"),
+    "avgBand2": ("band2", "mean"),
+    "F1STD": ("f1", "std"),
+    "f3STD": ("f3", "std"),
+    "f3meanf1": ("f3f1", "mean"),
+    "f2meanf1": ("f2f1", "mean"),
+    "f2STDf1": ("f2f1", "std"),
+    "fmean3": ("f3", "mean"),
+}
+
+
+def _mean(x):
+    return np.mean(x) if x.size > 0 else 0
+
+
+def _std(x):
+    return np.std(x) if x.size > 0 else 0
+
+
+def percent_unvoiced(duration, total_silence_dur, n_voiced, time_step):
+    """침묵(Silence) 구간은 제외하고, '말하고 있는 구간' 내에서의 무성음 비율 (n_voiced: 유효 피치 프레임 수)"""
+    speaking_duration = duration - total_silence_dur
+    voiced_duration = n_voiced * time_step
+
+    if speaking_duration > 0:
+        # 이론상 발화시간보다 유성음 시간이 길 수 없으나 오차 보정
+        unvoiced_duration = max(0, speaking_duration - voiced_duration)
+        percent = unvoiced_duration / speaking_duration
+    else:
+        percent = 0
+
+    # 값 범위 안전장치 (0.0 ~ 1.0)
+    return min(1.0, max(0.0, percent))
+
+
+def pause_features(pause_durs, total_silence_dur, duration):
+    """휴지 길이 배열 / 총 침묵 시간 -> 휴지 Feature"""
+    return {
+        "avgDurPause": _mean(pause_durs),
+        "maxDurPause": np.max(pause_durs) if pause_durs.size > 0 else 0,
+        "PercentBreaks": total_silence_dur / duration if duration > 0 else 0,
+    }
+
+
+def formant_values(freqs, bws):
+    """Formant Feature 계산에 쓰이는 유효 값 배열 (NaN 제외, 비율은 F1 > 0인 프레임만)"""
+    f1, f2, f3 = freqs[:, 0], freqs[:, 1], freqs[:, 2]
+
+    # Ratio calculation (F1이 유효하고 0보다 큰 프레임만)
+    f1_ok = ~np.isnan(f1) & (f1 > 0)
+    mask2 = f1_ok & ~np.isnan(f2)
+    mask3 = f1_ok & ~np.isnan(f3)
+    return {
+        "band1": bws[:, 0][~np.isnan(bws[:, 0])],
+        "band2": bws[:, 1][~np.isnan(bws[:, 1])],
+        "f1": f1[~np.isnan(f1)],
+        "f3": f3[~np.isnan(f3)],
+        "f2f1": f2[mask2] / f1[mask2],
+        "f3f1": f3[mask3] / f1[mask3],
+    }
+
+
+class FeatureEngine:
+    """
+    Normalization 완료된 Sound 1개에 대한 lazy feature graph
+    - Praat 객체(Pitch, Intensity, Formant, PointProcess, silence TextGrid)는 처음 필요할 때 1회만 생성
+    - 요청한 Feature가 의존하는 객체만 계산 (예: Friendly만 필요하면 Formant는 생성하지만 다른 단계는 생략 가능)
+
+    params: 분석 프로파일 (prosody_profiles) - time_step (Pitch/Formant 공통), max_number_of_formants,
+            maximum_formant, pitch_method, point_process_method
+    timer: prosody_timing.StageTimer (None이면 계측 생략)
+    sounding_only: True면 Pitch / Formant / PointProcess를 침묵 구간을 뺀 발화 구간(이어 붙인 Sound)에서만 계산
+    """
+
+    def __init__(self, sound, params, timer=None, sounding_only=False):
+        self.sound = sound
+        self.params = params
+        self.timer = timer
+        self.sounding_only = sounding_only
+        self.duration = sound.get_total_duration()
+        self._groups = {}
+
+    # ------------------------------------------------------------------
+    # Praat 객체 (lazy, 최대 1회 생성)
+    # ------------------------------------------------------------------
+    @cached_property
+    def silences(self):
+        """침묵 TextGrid 구간 (starts, ends, labels) - Normalization 되었으므로 -35dB 사용"""
+        return timed(self.timer, "silences", lambda: silence_intervals(self.sound, SILENCE_THRESHOLD, 0.5, 0.1),
+                     lambda s: {"intervals": s[0].size})
+
+    @cached_property
+    def voice_sound(self):
+        """Pitch / Formant / PointProcess 분석 대상 (sounding_only면 발화 구간만 이어 붙인 Sound)"""
+        if not self.sounding_only:
+            return self.sound
+        starts, ends, labels = self.silences
+        sounding = labels == "sounding"
+        if not np.any(sounding):
+            return self.sound
+
+        def concat():
+            sr = self.sound.sampling_frequency
+            values = self.sound.values[0]
+            bounds = np.rint((np.stack([starts[sounding], ends[sounding]], axis=1) - self.sound.xmin) * sr).astype(np.int64)
+            return parselmouth.Sound(np.concatenate([values[a:b] for a, b in bounds]), sampling_frequency=sr)
+        return timed(self.timer, "sounding_concat", concat,
+                     lambda s: {"duration": s.duration, "intervals": int(np.sum(sounding))})
+
+    @cached_property
+    def pitch(self):
+        # Normalization 덕분에 신호가 명확하므로 pitch_floor 50Hz로 저음역대 커버
+        sound = self.voice_sound
+        to_pitch = sound.to_pitch_cc if self.params.get("pitch_method") == "cc" else sound.to_pitch
+        return timed(self.timer, "to_pitch",
+                     lambda: to_pitch(time_step=self.params["time_step"], pitch_floor=50.0, pitch_ceiling=500.0),
+                     lambda p: {"frames": p.n_frames})
+
+    @cached_property
+    def pitch_values(self):
+        """프레임별 F0 (무성 프레임 0)"""
+        return self.pitch.selected_array['frequency']
+
+    @cached_property
+    def voiced_pitch(self):
+        """유효 피치 (50Hz 이상)"""
+        pitch_vals = self.pitch_values
+        return pitch_vals[pitch_vals >= 50.0]
+
+    @cached_property
+    def intensity(self):
+        return timed(self.timer, "to_intensity", self.sound.to_intensity, lambda i: {"frames": i.n_frames})
+
+    @cached_property
+    def intensity_values(self):
+        return self.intensity.values[0]
+
+    @cached_property
+    def formant(self):
+        sound = self.voice_sound
+        return timed(self.timer, "to_formant_burg", lambda: sound.to_formant_burg(
+            time_step=self.params["time_step"],
+            max_number_of_formants=self.params["max_number_of_formants"],
+            maximum_formant=self.params["maximum_formant"]), lambda f: {"frames": f.n_frames})
+
+    @cached_property
+    def formant_tracks(self):
+        """time_step 격자 시점의 F1~F3 / 대역폭 (각각 (프레임 수, 3), 없는 값은 NaN)"""
+        formant = self.formant
+        times = np.arange(0, self.voice_sound.get_total_duration(), self.params["time_step"])
+        return timed(self.timer, "formant_frames", lambda: formant_tracks(formant, times, 3),
+                     lambda _: {"frames": times.size})
+
+    @cached_property
+    def point_process(self):
+        """
+        성대 진동 주기 시점
+        - "periodic" (기본): 별도 cross-correlation Pitch 분석 (기준 분포의 shimmer가 이 방식으로 보정됨)
+        - "pitch": 이미 계산한 Pitch를 재사용 (유성 구간에만 point 생성)
+        """
+        sound = self.voice_sound
+        if self.params.get("point_process_method", "periodic") == "pitch":
+            pitch = self.pitch
+            make = lambda: call([sound, pitch], "To PointProcess (cc)")
+        else:
+            make = lambda: call(sound, "To PointProcess (periodic, cc)", 50, 500)
+        return timed(self.timer, "point_process", make, lambda pp: {"points": call(pp, "Get number of points")})
+
+    @cached_property
+    def n_points(self):
+        """성대 진동 주기 수 (shimmer / jitter 병합 가중치)"""
+        return int(call(self.point_process, "Get number of points"))
+
+    @cached_property
+    def pauses(self):
+        """(silent 구간 길이 배열, 총 침묵 시간)"""
+        return silent_durations(*self.silences)
+
+    # ------------------------------------------------------------------
+    # Feature 그룹
+    # ------------------------------------------------------------------
+    def _pitch_features(self):
+        valid = self.voiced_pitch
+        return {
+            "mean pitch": _mean(valid),
+            "max pitch": np.max(valid) if valid.size > 0 else 0,
+        }
+
+    def _intensity_features(self):
+        int_vals = self.intensity_values
+        max_int = np.max(int_vals)
+        return {
+            "intensityMean": np.mean(int_vals),
+            "intensityMax": max_int,
+            "diffIntMaxMin": max_int - np.min(int_vals),
+            "intensitySD": np.std(int_vals),
+        }
+
+    def _formant_features(self):
+        v = formant_values(*self.formant_tracks)
+        return {name: (_mean if stat == "mean" else _std)(v[key]) for name, (key, stat) in FORMANT_FEATURES.items()}
+
+    def _unvoiced_features(self):
+        _, total_silence_dur = self.pauses
+        return {"percentUnvoiced": percent_unvoiced(self.duration, total_silence_dur, len(self.voiced_pitch),
+                                                    self.params["time_step"])}
+
+    def _pause_features(self):
+        return pause_features(*self.pauses, self.duration)
+
+    def _perturbation_features(self):
+        # 주기 길이 0.1~20ms, 인접 주기 비 1.3 이내인 유성 구간 주기만 사용
+        point_process = self.point_process
+        try:
+            shimmer = timed(self.timer, "shimmer", lambda: call(
+                [self.voice_sound, point_process], "Get shimmer (local)", 0, 0, 0.0001, 0.02, 1.3, 1.6))
+        except Exception:
+            shimmer = 0
+        try:
+            jitter = timed(self.timer, "jitter", lambda: call(
+                point_process, "Get jitter (local)", 0, 0, 0.0001, 0.02, 1.3))
+        except Exception:
+            jitter = 0
+        return {"shimmer": shimmer, "jitter": jitter}
+
+    def features(self, names):
+        """요청한 Feature만 계산하여 {이름: 값} 반환 (의존하는 Praat 객체만 생성)"""
+        out = {}
+        for name in names:
+            group = FEATURE_GROUPS[name]
+            if group not in self._groups:
+                self._groups[group] = getattr(self, f"_{group}_features")()
+            out[name] = self._groups[group][name]
+        return out
+
+    def tracks(self, names, dtype=np.float32):
+        """
+        names의 Feature를 다시 계산하는 데 필요한 프레임 단위 트랙 (TrackEngine으로 재집계 가능)
+        - pitch(무성 0) / intensity / formant_freqs, formant_bws (프레임, 3)는 dtype 배열
+        - 침묵 구간 경계는 float64 (휴지 통계 정확도 유지), shimmer / jitter는 값 그대로
+        """
+        groups = {FEATURE_GROUPS[n] for n in names}
+        out = {"duration": self.duration, "time_step": self.params["time_step"],
+               "pitch": self.pitch_values.astype(dtype)}
+        if "intensity" in groups:
+            out["intensity"] = self.intensity_values.astype(dtype)
+        if "formant" in groups:
+            freqs, bws = self.formant_tracks
+            out["formant_freqs"], out["formant_bws"] = freqs.astype(dtype), bws.astype(dtype)
+        if groups & {"pause", "unvoiced"}:
+            starts, ends, labels = self.silences
+            out["silence_starts"], out["silence_ends"], out["silence_silent"] = starts, ends, labels == "silent"
+        if "perturbation" in groups:
+            out.update(self.features(["shimmer", "jitter"]))
+        return out
+
+
+class TrackEngine(FeatureEngine):
+    """
+    저장된 프레임 트랙(FeatureEngine.tracks)으로 Feature 재계산
+    - Praat 객체 대신 트랙 배열을 cached_property 자리에 넣어 FeatureEngine과 같은 집계 코드 사용
+    - float64 트랙이면 원래 analyze 결과와 동일, float32면 상대 오차 약 1e-7
+    """
+
+    def __init__(self, tracks):
+        self.params = {"time_step": tracks["time_step"]}
+        self.timer = None
+        self.sounding_only = False
+        self.duration = tracks["duration"]
+        self._groups = {}
+
+        pitch = np.asarray(tracks["pitch"], dtype=float)
+        self.voiced_pitch = pitch[pitch >= 50.0]
+        if "intensity" in tracks:
+            self.intensity_values = np.asarray(tracks["intensity"], dtype=float)
+        if "formant_freqs" in tracks:
+            self.formant_tracks = (np.asarray(tracks["formant_freqs"], dtype=float),
+                                   np.asarray(tracks["formant_bws"], dtype=float))
+        if "silence_starts" in tracks:
+            labels = np.where(tracks["silence_silent"], "silent", "sounding")
+            self.silences = (np.asarray(tracks["silence_starts"]), np.asarray(tracks["silence_ends"]), labels)
+        if "shimmer" in tracks:
+            self._groups["perturbation"] = {"shimmer": tracks["shimmer"], "jitter": tracks.get("jitter", 0)}
+
+
+class ProsodyAnalyzerBase:
+    """
+    분석기 공통 파이프라인: 디코딩 -> Peak Norm -> FeatureEngine -> 성별 감지 -> 점수
+    하위 클래스(프리셋)는 FEATURES / PROFILE과 가중치 / 기준 분포만 정의
+    """
+    FEATURES = ()          # 기본으로 계산할 Feature (raw_features 순서)
+    PROFILE = "standard"   # 기본 분석 프로파일 (prosody_profiles.PROFILES)
+    SCORE_DETAILS = False  # True면 scores[카테고리] = {"score", "details"}, False면 점수 값만
+    gender_threshold = GENDER_PITCH_THRESHOLD   # 성별 감지 기준 피치 (기준 분포 파일로 교체 가능)
+    memory_budget = None   # 요청 1개 메모리 예산 (바이트, None이면 허용 검사 생략)
+    over_budget = "reject"
+    memory_model = None    # None이면 prosody_admission.MEMORY_MODEL
+
+    def __init__(self, cache=None, timings=False, timing_hook=None, sounding_only=False, profile=None,
+                 keep_tracks=False, baseline=None, keep_summary=False, concurrent_stages=False,
+                 memory_budget=None, over_budget="reject", memory_model=None):
+        # 1. 결과 캐시 (prosody_cache.AnalysisCache, 선택)
+        self.cache = cache
+
+        # 2. 단계별 계측 (timings=True면 metadata["timings"] 포함, timing_hook(stage, record)는 단계마다 호출)
+        self.timings = timings
+        self.timing_hook = timing_hook
+
+        # 3. 발화 구간 전용 분석 (True면 Pitch / Formant를 침묵을 뺀 구간에서만 계산, 점수가 약간 달라짐)
+        self.sounding_only = sounding_only
+
+        # 4. 분석 프로파일 (이름: realtime / standard / research, 또는 PROFILE 위에 덮어쓸 dict)
+        self.engine_params = resolve_profile(profile or self.PROFILE, base=self.PROFILE)
+
+        # 5. 프레임 트랙 반환 (True면 result["tracks"] 포함 -> prosody_tracks.TrackStore에 저장 후 재채점)
+        self.keep_tracks = keep_tracks
+
+        # 6. 코퍼스 재보정 기준 분포 파일 (prosody_baseline.py 출력, 지정 시 baseline_male / baseline_female / 성별 기준 피치 교체)
+        if baseline is not None:
+            self.use_baseline(baseline)
+
+        # 7. 답변별 요약 통계 반환 (True면 result["summary"] 포함 -> prosody_summary.merge_summaries로 세션 채점)
+        self.keep_summary = keep_summary
+
+        # 8. 파일 1개 안의 분석 단계 동시 실행 (True면 Pitch / Intensity / Formant / 침묵을 프로세스 풀에서 동시에 계산, 결과 동일)
+        self.concurrent_stages = concurrent_stages
+
+        # 9. 업로드 허용 검사 (memory_budget: 요청 1개 메모리 예산 바이트, 초과 시 over_budget 정책 reject / truncate / chunked)
+        if memory_budget is not None:
+            self.set_memory_budget(memory_budget, over_budget, memory_model)
+
+    def set_memory_budget(self, budget, policy="reject", model=None):
+        """
+        업로드 허용 검사 설정 (prosody_admission)
+        - budget: 요청 1개의 최대 메모리 증가량 (바이트), policy: reject / truncate / chunked
+        - model: {"base", "per_sample", "per_frame"} (분석기 / 프로파일별로 다시 측정한 값, 생략 시 기본 모델)
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown over-budget policy '{policy}' (available: {', '.join(POLICIES)})")
+        self.memory_budget = budget
+        self.over_budget = policy
+        self.memory_model = model
+
+    def use_baseline(self, baseline):
+        """
+        코퍼스 재보정 기준 분포(prosody_baseline.py 출력 파일 경로 또는 dict)로 교체
+        - 파일에 있는 Feature만 교체 (나머지는 기존 상수 유지), 성별 감지 기준 피치도 함께 교체
+        """
+        if isinstance(baseline, str):
+            with open(baseline) as f:
+                baseline = json.load(f)
+        self.set_tables(baseline_male={**self.baseline_male, **baseline["male"]},
+                        baseline_female={**self.baseline_female, **baseline["female"]},
+                        gender_threshold=baseline["gender_threshold"])
+        if baseline.get("profile") not in (None, self.engine_params):
+            print(f"[Baseline Warning] baseline profile {baseline['profile']} != {self.engine_params}")
+
+    def _new_timer(self):
+        """timings / timing_hook 설정 시 StageTimer, 아니면 None (계측 비활성)"""
+        if not self.timings and self.timing_hook is None:
+            return None
+        return StageTimer(self.timing_hook)
+
+    def _cache_variant(self):
+        """캐시 키에 포함될 분석기 변형/파라미터 식별자"""
+        return f"{type(self).__name__}:{profile_key(self.engine_params)}" + (":sounding" if self.sounding_only else "")
+
+    def _load_sound(self, input_path):
+        """미디어 파일을 프로파일 샘플레이트(기본 16kHz) Mono Sound로 디코딩 (분석 형식 WAV는 직접 읽기, 그 외 FFmpeg)"""
+        return decode_sound(input_path, self.engine_params["sample_rate"])[0]
+
+    def _needed_features(self, categories=None, features=None):
+        """요청한 카테고리 점수 / Feature 목록에 필요한 Feature (성별 감지용 mean pitch 포함)"""
+        if categories is None and features is None:
+            return list(self.FEATURES)
+        names = set(features or ())
+        for category in categories or ():
+            names.update(self.weights[category])
+        names.add("mean pitch")
+        extra = sorted(n for n in names if n not in self.FEATURES)
+        return [n for n in self.FEATURES if n in names] + extra
+
+    def analyze(self, file_path, categories=None, features=None):
+        """
+        Process: Convert -> Peak Norm -> Extract -> Normalize -> Score
+        categories / features를 지정하면 해당 점수/Feature에 필요한 분석만 수행
+        """
+        timer = self._new_timer()
+        if self.memory_budget is not None:
+            return admit(self, file_path, categories=categories, features=features, timer=timer)
+        return self._analyze_file(file_path, categories, features, timer)
+
+    def _analyze_file(self, file_path, categories=None, features=None, timer=None, max_duration=None):
+        """디코딩 -> 분석 (max_duration: 앞부분 N초만 분석, 결과 캐시는 사용하지 않음)"""
+        if self.cache is not None and max_duration is None:
+            return self.cache.analyze(self, file_path, categories=categories, features=features, timer=timer)
+
+        # 사용한 디코더(wav / ffmpeg)는 metadata["timings"]["decode"]["decoder"]에 기록
+        sample_rate = self.engine_params["sample_rate"]
+        sound, decoder = timed(timer, "decode", lambda: decode_sound(file_path, sample_rate, max_duration),
+                               lambda d: {"duration": d[0].duration if d[0] is not None else 0, "decoder": d[1]})
+        if sound is None: return None
+        return self._analyze_sound(sound, categories=categories, features=features, timer=timer)
+
+    def _analyze_sound(self, sound, categories=None, features=None, timer=None):
+        """디코딩된 Sound 분석 (Peak Norm 이후 단계)"""
+        try:
+            # ========================================================
+            # [Normalization] -1dB Peak Normalization 적용
+            # ========================================================
+            # 10^(-1/20) ≈ 0.89125 (Amplitude Scale)
+            # 오디오의 최대 진폭을 0.89로 맞춤 -> 분석 기준 통일
+            timed(timer, "scale_peak", lambda: sound.scale_peak(PEAK_TARGET))
+            names = self._needed_features(categories, features)
+            if self.concurrent_stages and not self.sounding_only:
+                # prosody_parallel이 prosody_engine을 import하므로 여기서 import
+                from prosody_parallel import concurrent_engine
+                engine = concurrent_engine(sound, self.engine_params, names, timer)
+            else:
+                engine = FeatureEngine(sound, self.engine_params, timer, sounding_only=self.sounding_only)
+            raw_features = engine.features(names)
+            tracks = engine.tracks(names) if self.keep_tracks else None
+            summary = None
+            if self.keep_summary:
+                # prosody_summary가 prosody_engine을 import하므로 여기서 import
+                from prosody_summary import summarize
+                summary = summarize(engine, names)
+        except Exception as e:
+            print(f"[Analysis Error] {e}")
+            return None
+
+        if categories is None and features is not None:
+            categories = []
+        result = timed(timer, "scoring", lambda: self._score(raw_features, categories))
+        if tracks is not None:
+            result["tracks"] = tracks
+        if summary is not None:
+            result["summary"] = summary
+        return self._with_timings(result, timer)
+
+    def features_from_tracks(self, tracks, categories=None, features=None):
+        """
+        저장된 프레임 트랙(result["tracks"] / TrackStore)으로 raw_features를 다시 계산하여 채점
+        디코딩 / Praat 분석 없이 NumPy 집계만 수행 (가중치 / 기준 분포 변경 시 재채점용)
+        """
+        try:
+            raw_features = TrackEngine(tracks).features(self._needed_features(categories, features))
+        except (KeyError, AttributeError) as e:
+            # 저장되지 않은 트랙이 필요한 경우 (예: Light로 저장한 트랙에서 shimmer 요청)
+            print(f"[Analysis Error] track not stored: {e}")
+            return None
+        if categories is None and features is not None:
+            categories = []
+        return self._score(raw_features, categories)
+
+    def score_summary(self, summary, categories=None, features=None):
+        """
+        답변별 요약(result["summary"]) 또는 merge_summaries로 합친 세션 요약을 채점 (재분석 없음)
+        반환 형태는 analyze와 같음, 필요한 통계가 없으면 None
+        """
+        from prosody_summary import summary_features
+        try:
+            raw_features = summary_features(summary, self._needed_features(categories, features))
+        except KeyError as e:
+            print(f"[Analysis Error] summary statistic not stored: {e}")
+            return None
+        if categories is None and features is not None:
+            categories = []
+        return self._score(raw_features, categories)
+
+    def _with_timings(self, result, timer):
+        """timings=True면 단계별 계측 결과를 metadata["timings"]에 추가"""
+        if timer is not None and self.timings and result is not None:
+            result["metadata"]["timings"] = timer.stages
+        return result
+
+    @property
+    def scoring(self):
+        """
+        가중치 / 기준 분포를 NumPy 배열로 컴파일한 ScoringTable
+        - weights / baseline_male / baseline_female / gender_threshold가 다른 객체로 바뀌면 다시 컴파일
+          (dict 내부만 수정한 경우는 감지되지 않으므로 set_tables로 교체)
+        - 모듈 상수(읽기 전용) 테이블이면 프로세스 안의 모든 인스턴스가 같은 ScoringTable 공유
+        """
+        tables = (self.weights, self.baseline_male, self.baseline_female)
+        key = tuple(map(id, tables)) + (self.gender_threshold,)
+        cached = self.__dict__.get("_scoring")
+        if cached is not None and cached[0] == key:
+            return cached[2]
+        if all(isinstance(t, MappingProxyType) for t in tables):
+            shared = _SHARED_SCORING.get(key)
+            if shared is None:
+                # 테이블 객체도 함께 보관 -> 보관 중에는 id가 재사용되지 않음
+                shared = _SHARED_SCORING[key] = (tables, ScoringTable(*tables, self.gender_threshold))
+            table = shared[1]
+        else:
+            table = ScoringTable(*tables, self.gender_threshold)
+        self._scoring = (key, tables, table)
+        return table
+
+    def set_tables(self, weights=None, baseline_male=None, baseline_female=None, gender_threshold=None):
+        """가중치 / 기준 분포 / 성별 기준 피치 교체 (None인 항목은 유지) -> 다음 채점부터 새 ScoringTable 사용"""
+        if weights is not None:
+            self.weights = weights
+        if baseline_male is not None:
+            self.baseline_male = baseline_male
+        if baseline_female is not None:
+            self.baseline_female = baseline_female
+        if gender_threshold is not None:
+            self.gender_threshold = gender_threshold
+        self.__dict__.pop("_scoring", None)
+
+    def __getstate__(self):
+        # 컴파일된 ScoringTable 캐시는 제외 (읽기 전용 테이블은 pickle 불가, 워커에서 다시 컴파일)
+        state = self.__dict__.copy()
+        state.pop("_scoring", None)
+        return state
+
+    def score_batch(self, feature_matrix, genders=None, details=False):
+        """
+        저장된 Feature 벡터 N개를 한 번에 재채점 (열 순서: self.scoring.features)
+        반환: (N, 카테고리) 점수 [반올림 전], details=True면 (점수, (N, 카테고리, Feature) 기여도)
+        """
+        return self.scoring.score_batch(feature_matrix, genders, details=details)
+
+    def _score(self, raw_features, categories=None):
+        """성별 감지 -> Z-Score 정규화 -> 가중합 점수 산출 (categories=None이면 전체 카테고리)"""
+        table = self.scoring
+
+        # Gender Detection
+        pitch_val = raw_features["mean pitch"]
+        gender = "Male" if pitch_val < table.gender_threshold else "Female"
+
+        # Normalization (Z-Score) + Scoring - score_batch와 같은 계산 경로 (1행)
+        x = table.to_matrix([raw_features])
+        totals, contributions = table.score_batch(x, [gender], details=True)
+
+        scores = {}
+        for c, category in enumerate(table.categories):
+            if categories is not None and category not in categories:
+                continue
+            total = totals[0, c]
+            if self.SCORE_DETAILS:
+                idx = table.terms[c][0]
+                details = {table.features[i]: round(contributions[0, c, i], 4) for i in idx}
+                scores[category] = {"score": round(total, 4), "details": details}
+            else:
+                scores[category] = round(total, 4)
+
+        return {
+            "metadata": {"gender": gender, "mean_pitch": round(pitch_val, 2)},
+            "scores": scores,
+            "raw_features": raw_features
+        }
+
+    def analyze_many(self, paths, workers=None, timeout=None):
+        """
+        여러 파일을 프로세스 풀로 병렬 분석 (끝나는 순서대로 결과 스트리밍)
+        yield: (path, 결과 dict 또는 Exception) - 한 파일의 실패가 배치 전체를 멈추지 않음
+        """
+        from prosody_batch import run_batch   # multiprocessing은 배치 분석 시에만 import
+        return run_batch(self, paths, workers=workers, timeout=timeout)
+
+    def analyze_long(self, file_path, segment_duration=300.0, workers=None, categories=None, features=None):
+        """
+        긴 녹음(45~90분)용: 침묵 지점에서 분할 -> 세그먼트 병렬 분석 -> 통계 병합
+        전체 파일 analyze와 허용 오차 내에서 일치 (metadata["segments"]에 세그먼트 수)
+        """
+        # prosody_segment가 FeatureEngine을 사용하므로 순환 import 방지를 위해 여기서 import
+        from prosody_segment import analyze_segmented
+        timer = self._new_timer()
+        result = analyze_segmented(self, file_path, segment_duration=segment_duration, workers=workers,
+                                   categories=categories, features=features, timer=timer)
+        return self._with_timings(result, timer)
+
+    async def analyze_async(self, file_path, runner=None):
+        """
+        asyncio용 analyze (FFmpeg는 비동기 subprocess, Praat 분석은 executor에서 실행)
+        runner: 동시 실행 수 / executor 설정 (prosody_async.AsyncRunner, 기본은 프로세스 공용)
+        """
+        from prosody_async import default_runner
+        return await (runner or default_runner()).analyze(self, file_path)
@@ -0,0 +1,110 @@
+import os
+import threading
+import multiprocessing
+from multiprocessing import shared_memory
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import parselmouth
+
+from prosody_engine import FEATURE_GROUPS, FeatureEngine
+from prosody_timing import StageTimer
+
+# ==========================================
+# 파일 1개 안의 분석 단계 병렬 실행
+# ==========================================
+# parselmouth는 Praat 호출 중 GIL을 놓지 않으므로 (다른 스레드가 진행되지 않음) 스레드 대신 프로세스 사용
+# - 정규화된 Sound 샘플은 shared memory로 1회만 복사, 단계별 워커가 같은 샘플로 Sound 생성 (결과 동일)
+# - 워커는 Praat 객체 대신 Feature 계산에 필요한 배열만 반환 -> FeatureEngine의 cached_property 자리에 채움
+# - 단계: pitch (+ PointProcess / shimmer / jitter), intensity, formant, silences
+
+_pool = None
+_pool_workers = None
+_pool_lock = threading.Lock()   # 여러 스레드가 동시에 첫 요청을 보내도 풀은 1개만 생성
+
+
+def stage_pool(workers=None):
+    """
+    단계 실행용 프로세스 풀 (프로세스 공용, 처음 사용할 때 생성)
+    - spawn 컨텍스트: 스레드가 있는 프로세스(서버 / 비동기 실행기)에서 fork하면 잠긴 lock이 복사될 수 있음
+    """
+    global _pool, _pool_workers
+    workers = workers or min(4, os.cpu_count() or 1)
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown()
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            _pool_workers = workers
+        return _pool
+
+
+def _stages(names):
+    """names에 필요한 단계 목록 (pitch는 성별 감지용으로 항상 포함)"""
+    groups = {FEATURE_GROUPS[n] for n in names}
+    stages = ["pitch"]
+    if "formant" in groups:
+        stages.insert(0, "formant")   # 가장 오래 걸리는 단계부터 제출
+    if groups & {"pause", "unvoiced"}:
+        stages.append("silences")
+    if "intensity" in groups:
+        stages.append("intensity")
+    return stages, "perturbation" in groups
+
+
+def _run_stage(shm_name, n_samples, sample_rate, xmin, params, stage, perturbation, timing):
+    """워커: shared memory 샘플로 Sound 생성 후 단계 1개 실행 -> (cached_property 값 dict, 단계별 계측)"""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        values = np.ndarray((n_samples,), dtype=np.float64, buffer=shm.buf)
+        sound = parselmouth.Sound(values, sampling_frequency=sample_rate, start_time=xmin)   # Praat 쪽으로 복사
+        del values   # buffer 참조 해제 후 close 가능
+    finally:
+        shm.close()
+    timer = StageTimer() if timing else None
+    engine = FeatureEngine(sound, params, timer)
+
+    if stage == "pitch":
+        slots = {"pitch_values": engine.pitch_values}
+        if perturbation:
+            slots["perturbation"] = engine.features(["shimmer", "jitter"])
+            slots["n_points"] = engine.n_points
+    elif stage == "formant":
+        slots = {"formant_tracks": engine.formant_tracks}
+    elif stage == "silences":
+        slots = {"silences": engine.silences}
+    else:
+        slots = {"intensity_values": engine.intensity_values}
+    return slots, (timer.stages if timer is not None else {})
+
+
+def concurrent_engine(sound, params, names, timer=None, workers=None):
+    """
+    names에 필요한 단계를 프로세스 풀에서 동시에 실행한 FeatureEngine 반환
+    (이후 features() / tracks()는 채워진 값으로 집계만 수행 - 무성음 비율 / 점수는 호출 측에서 계산)
+    """
+    stages, perturbation = _stages(names)
+    # daemon 프로세스(분석 서버 / 배치 워커)는 자식 프로세스를 만들 수 없으므로 순차 실행
+    if len(stages) < 2 or multiprocessing.current_process().daemon:
+        return FeatureEngine(sound, params, timer)
+    values = sound.values[0]
+    shm = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+    try:
+        np.ndarray(values.shape, dtype=np.float64, buffer=shm.buf)[:] = values
+        pool = stage_pool(workers)
+        futures = [pool.submit(_run_stage, shm.name, values.size, sound.sampling_frequency, sound.xmin, params, stage,
+                               perturbation, timer is not None) for stage in stages]
+        results = [f.result() for f in futures]
+    finally:
+        shm.close()
+        shm.unlink()
+
+    engine = FeatureEngine(sound, params, timer)
+    for slots, stage_timings in results:
+        if "perturbation" in slots:
+            engine._groups["perturbation"] = slots.pop("perturbation")
+        engine.__dict__.update(slots)   # cached_property 값으로 사용
+        for stage, rec in stage_timings.items():
+            rec = dict(rec)
+            timer.record(stage, rec.pop("seconds"), **rec)
+    return engine
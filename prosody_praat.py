@@ -0,0 +1,134 @@
+import numpy as np
+from parselmouth.praat import call
+
+
+def _formant_frame_arrays(formant, n_formants):
+    """
+    Formant 객체의 프레임별 주파수/대역폭을 (프레임 수, n_formants) 배열로 한 번에 추출
+    - FormantTier -> TableOfReal -> Matrix 경로는 double 값을 그대로 복사 (정밀도 손실 없음)
+    - 해당 프레임에 없는 포먼트는 NaN
+    """
+    nx = formant.nx
+    freqs = np.full((nx, n_formants), np.nan)
+    bws = np.full((nx, n_formants), np.nan)
+    if nx == 0:
+        return freqs, bws
+
+    tier = call(formant, "Down to FormantTier")
+    table = call(tier, "Down to TableOfReal", "yes", "yes")
+    # 열 구성: time, F1, B1, F2, B2, ... (없는 포먼트는 0으로 채워짐)
+    m = call(table, "To Matrix").values
+    n = min(n_formants, (m.shape[1] - 1) // 2)
+    f = m[:, 1:2 * n:2]
+    b = m[:, 2:2 * n + 1:2]
+    defined = f > 0
+    freqs[:, :n] = np.where(defined, f, np.nan)
+    bws[:, :n] = np.where(defined, b, np.nan)
+    return freqs, bws
+
+
+def _interpolate_frames(sampled, frame_vals, times):
+    """
+    Praat의 Sampled_getValueAtX (linear interpolation)과 동일한 규칙으로
+    여러 시점의 값을 한 번에 계산 -> get_value_at_time 반복 호출과 같은 값
+    """
+    nx = sampled.nx
+    out_shape = (len(times),) + frame_vals.shape[1:]
+    if nx == 0:
+        return np.full(out_shape, np.nan)
+
+    times = np.asarray(times, dtype=float)
+    ireal = (times - sampled.x1) / sampled.dx + 1.0
+    ileft = np.floor(ireal).astype(np.int64)
+    phase = ireal - ileft
+
+    # 가까운 프레임(near)과 반대편 프레임(far) 선택
+    right_half = phase >= 0.5
+    inear = np.where(right_half, ileft + 1, ileft)
+    ifar = np.where(right_half, ileft, ileft + 1)
+    phase = np.where(right_half, 1.0 - phase, phase)
+
+    in_domain = (times >= sampled.xmin) & (times <= sampled.xmax)
+    near_ok = in_domain & (inear >= 1) & (inear <= nx)
+    far_ok = (ifar >= 1) & (ifar <= nx)
+
+    # 0-based 인덱스 (범위 밖은 임시로 0번 프레임 사용 후 마스킹)
+    fnear = frame_vals[np.where(near_ok, inear - 1, 0)]
+    ffar = frame_vals[np.where(far_ok, ifar - 1, 0)]
+    if frame_vals.ndim > 1:
+        phase = phase[:, None]
+        near_ok = near_ok[:, None]
+        far_ok = far_ok[:, None]
+
+    # far 값이 없으면 near 값 그대로 사용 (Praat의 extrapolate 규칙)
+    use_far = far_ok & ~np.isnan(ffar)
+    vals = np.where(use_far, fnear + phase * (ffar - fnear), fnear)
+    return np.where(near_ok, vals, np.nan)
+
+
+def formant_tracks(formant, times, n_formants):
+    """
+    주어진 시점들의 F1~Fn 주파수와 대역폭을 NumPy 배열로 일괄 추출
+    반환: (freqs, bws) 각각 (len(times), n_formants), 정의되지 않은 값은 NaN
+    """
+    freqs, bws = _formant_frame_arrays(formant, n_formants)
+    both = np.concatenate([freqs, bws], axis=1)
+    tracks = _interpolate_frames(formant, both, times)
+    return tracks[:, :n_formants], tracks[:, n_formants:]
+
+
+def _tier_points(textgrid, command, label):
+    """TextGrid 1번 tier에서 label과 일치하는 구간의 경계 시점들을 배열로 반환"""
+    points = call(textgrid, command, 1, "is equal to", label)
+    if call(points, "Get number of points") == 0:
+        return np.zeros(0)
+    return call(points, "To Matrix").values[0]
+
+
+def silence_intervals(sound, silence_threshold=-35.0, min_silent=0.5, min_sounding=0.1):
+    """
+    To TextGrid (silences) 결과의 모든 구간을 배열로 일괄 추출
+    - 구간마다 call()을 3~4회 반복하지 않고, label별 시작/끝 시점을 한 번에 가져옴
+    반환: (starts, ends, labels) - 시간순 정렬, labels는 "silent" / "sounding"
+    """
+    textgrid = call(sound, "To TextGrid (silences)", 50.0, 0.0, silence_threshold,
+                    min_silent, min_sounding, "silent", "sounding")
+    return _textgrid_intervals(textgrid)
+
+
+def intensity_silence_intervals(times, values, duration, silence_threshold=-35.0, min_silent=0.5, min_sounding=0.1):
+    """
+    Intensity 프레임 값(dB)으로부터 silence_intervals와 같은 구간 추출
+    - 여러 구간에서 계산한 프레임을 이어 붙인 경우에도 전체 최대 강도 기준 임계값 1개로 판정
+    - times는 등간격 (Sound의 To TextGrid (silences) 내부와 같은 Intensity -> TextGrid 경로)
+    """
+    dx = times[1] - times[0] if times.size > 1 else duration
+    matrix = call("Create Matrix", "silences", 0, duration, times.size, dx, times[0], 1, 1, 1, 1, 1, "0")
+    matrix.values[:] = values[None, :]
+    intensity = call(matrix, "To Intensity")
+    textgrid = call(intensity, "To TextGrid (silences)", silence_threshold, min_silent, min_sounding, "silent", "sounding")
+    return _textgrid_intervals(textgrid)
+
+
+def _textgrid_intervals(textgrid):
+    starts, ends, labels = [], [], []
+    for label in ("silent", "sounding"):
+        s = _tier_points(textgrid, "Get starting points", label)
+        starts.append(s)
+        ends.append(_tier_points(textgrid, "Get end points", label))
+        labels.append(np.full(s.size, label))
+
+    starts = np.concatenate(starts)
+    order = np.argsort(starts, kind="stable")
+    return starts[order], np.concatenate(ends)[order], np.concatenate(labels)[order]
+
+
+def silent_durations(starts, ends, labels):
+    """
+    (starts, ends, labels) -> (silent 구간 길이 배열, 총 침묵 시간)
+    총합은 기존 구간별 누적 합과 같은 순서로 계산 (cumsum = 순차 합산)
+    """
+    silent = labels == "silent"
+    pause_durs = ends[silent] - starts[silent]
+    total_silence_dur = np.cumsum(pause_durs)[-1] if pause_durs.size > 0 else 0
+    return pause_durs, total_silence_dur
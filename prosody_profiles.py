@@ -0,0 +1,69 @@
+import json
+import importlib
+
+# ==========================================
+# 분석 프로파일 (속도 / 정확도 설정)
+# ==========================================
+# - time_step: Pitch / Formant 프레임 간격 (초)
+# - max_number_of_formants / maximum_formant: Formant(Burg) 설정
+# - pitch_method: "ac" (autocorrelation, 기본) / "cc" (cross-correlation)
+# - point_process_method: shimmer / jitter용 PointProcess 생성 방식
+#     "periodic" (기본, 기준 분포 보정 기준): To PointProcess (periodic, cc) - Pitch 분석을 한 번 더 수행
+#     "pitch": 이미 계산한 Pitch 재사용 (더 빠름, shimmer 1~10% 차이 - 기준 분포 재보정 전까지는 선택 사항)
+# - sample_rate: FFmpeg 디코딩 샘플레이트 (Hz)
+PROFILES = {
+    "realtime": {"time_step": 0.04, "max_number_of_formants": 3, "maximum_formant": 3000,
+                 "pitch_method": "ac", "point_process_method": "periodic", "sample_rate": 8000},
+    "standard": {"time_step": 0.02, "max_number_of_formants": 3, "maximum_formant": 3000,
+                 "pitch_method": "ac", "point_process_method": "periodic", "sample_rate": 16000},
+    "research": {"time_step": 0.01, "max_number_of_formants": 5, "maximum_formant": 5500,
+                 "pitch_method": "ac", "point_process_method": "periodic", "sample_rate": 16000},
+}
+
+PITCH_METHODS = ("ac", "cc")
+POINT_PROCESS_METHODS = ("periodic", "pitch")
+
+
+def resolve_profile(profile, base="standard"):
+    """
+    프로파일 이름 또는 dict -> 분석 파라미터 dict
+    - dict는 base 프로파일 위에 덮어쓰는 custom 프로파일 (예: {"time_step": 0.015})
+    """
+    if isinstance(profile, str):
+        if profile not in PROFILES:
+            raise ValueError(f"Unknown profile '{profile}' (available: {', '.join(PROFILES)})")
+        return dict(PROFILES[profile])
+
+    params = dict(PROFILES[base])
+    unknown = set(profile) - set(params)
+    if unknown:
+        raise ValueError(f"Unknown profile keys: {', '.join(sorted(unknown))}")
+    params.update(profile)
+    if params["pitch_method"] not in PITCH_METHODS:
+        raise ValueError(f"pitch_method must be one of {PITCH_METHODS}")
+    if params["point_process_method"] not in POINT_PROCESS_METHODS:
+        raise ValueError(f"point_process_method must be one of {POINT_PROCESS_METHODS}")
+    return params
+
+
+def profile_key(params):
+    """캐시 키 등에 쓰이는 파라미터 식별 문자열 (이름이 같아도 값이 바뀌면 다른 키)"""
+    return json.dumps(params, sort_keys=True, separators=(",", ":"))
+
+
+# ==========================================
+# 분석기 프리셋 (preset 이름 -> 분석기 클래스)
+# ==========================================
+# 서버 / 기준 분포 / 벤치마크 CLI가 공통으로 사용 (분석기 모듈은 make_analyzer 호출 시 import)
+PRESETS = {
+    "light": ("prosody_analysis", "ProsodyAnalyzerLight"),
+    "full": ("prosody_analysis_all_feature", "ProsodyAnalyzer"),
+}
+
+
+def make_analyzer(preset, **options):
+    """preset 이름("light" / "full") -> 분석기 인스턴스 (options는 분석기 생성자 인자)"""
+    if preset not in PRESETS:
+        raise ValueError(f"Unknown preset '{preset}' (available: {', '.join(PRESETS)})")
+    module, cls = PRESETS[preset]
+    return getattr(importlib.import_module(module), cls)(**options)
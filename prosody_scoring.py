@@ -0,0 +1,104 @@
+from types import MappingProxyType
+
+import numpy as np
+
+# 성별 감지 기준 피치 (AI Hub 한국어 음성 데이터 기반)
+GENDER_PITCH_THRESHOLD = 175.0
+MALE, FEMALE = 0, 1
+
+
+def freeze_table(table):
+    """중첩 dict -> 읽기 전용 MappingProxyType (모듈 상수 가중치 / 기준 분포용)"""
+    return MappingProxyType({k: freeze_table(v) if isinstance(v, dict) else v for k, v in table.items()})
+
+
+class ScoringTable:
+    """
+    가중치 / 기준 분포(남/여)를 고정된 Feature 순서의 NumPy 배열로 컴파일한 점수 테이블
+    - features: 열 순서 (기준 분포 -> 가중치 순으로 등장한 Feature)
+    - mean / std: (2, F) 배열 (0행 Male, 1행 Female), std 0은 1로 대체
+    - 카테고리별 항(term)은 가중치 dict 순서를 유지 -> 누적 합 순서까지 기존 dict 순회와 동일
+    """
+
+    def __init__(self, weights, baseline_male, baseline_female, gender_threshold=GENDER_PITCH_THRESHOLD):
+        self.categories = tuple(weights)
+        self.gender_threshold = gender_threshold
+
+        features = list(baseline_male)
+        for table in [baseline_female] + list(weights.values()):
+            features += [f for f in table if f not in features]
+        self.features = tuple(features)
+        self.index = {f: i for i, f in enumerate(self.features)}
+
+        n = len(self.features)
+        self.mean = np.zeros((2, n))
+        self.std = np.ones((2, n))
+        self.has_baseline = np.zeros((2, n), dtype=bool)
+        for g, baseline in ((MALE, baseline_male), (FEMALE, baseline_female)):
+            for feat, stat in baseline.items():
+                i = self.index[feat]
+                self.mean[g, i] = stat['mean']
+                self.std[g, i] = stat['std'] if stat['std'] != 0 else 1
+                self.has_baseline[g, i] = True
+
+        # 카테고리별 (Feature 인덱스, 가중치) - 가중치 0인 항은 제외
+        self.terms = []
+        self.weight_matrix = np.zeros((len(self.categories), n))
+        for c, category in enumerate(self.categories):
+            items = [(feat, w) for feat, w in weights[category].items() if w != 0]
+            idx = np.array([self.index[f] for f, _ in items], dtype=np.int64)
+            w = np.array([w for _, w in items], dtype=float)
+            self.terms.append((idx, w))
+            self.weight_matrix[c, idx] = w
+
+    def to_matrix(self, raw_features_list):
+        """raw_features dict 목록 -> (N, F) 배열 (없는 Feature는 NaN)"""
+        x = np.full((len(raw_features_list), len(self.features)), np.nan)
+        for row, raw in enumerate(raw_features_list):
+            for feat, val in raw.items():
+                i = self.index.get(feat)
+                if i is not None:
+                    x[row, i] = val
+        return x
+
+    def detect_genders(self, feature_matrix):
+        """mean pitch 열 기준 성별 (0: Male, 1: Female)"""
+        pitch = feature_matrix[:, self.index["mean pitch"]]
+        return (pitch >= self.gender_threshold).astype(np.int64)
+
+    def _gender_codes(self, genders, feature_matrix):
+        if genders is None:
+            return self.detect_genders(feature_matrix)
+        genders = np.asarray(genders)
+        if genders.dtype.kind in "US":
+            return (genders == "Female").astype(np.int64)
+        return genders.astype(np.int64)
+
+    def zscores(self, feature_matrix, genders=None):
+        """(N, F) Z-Score 행렬 - 기준 분포가 없거나 값이 없는(NaN) Feature는 0"""
+        x = np.asarray(feature_matrix, dtype=float)
+        g = self._gender_codes(genders, x)
+        z = (x - self.mean[g]) / self.std[g]
+        return np.where(self.has_baseline[g] & ~np.isnan(x), z, 0.0)
+
+    def score_batch(self, feature_matrix, genders=None, details=False):
+        """
+        N개 행의 모든 카테고리 점수를 한 번에 계산
+        - feature_matrix: (N, F) 배열, 열 순서는 self.features
+        - genders: "Male"/"Female" 문자열 또는 0/1 배열 (None이면 mean pitch로 감지)
+        반환: scores (N, C) [반올림 전], details=True면 (scores, contributions (N, C, F))
+        """
+        z = self.zscores(feature_matrix, genders)
+        scores = np.zeros((z.shape[0], len(self.categories)))
+        contributions = np.zeros(z.shape[:1] + self.weight_matrix.shape) if details else None
+        for c, (idx, w) in enumerate(self.terms):
+            contrib = z[:, idx] * w
+            # 가중치 dict 순서대로 순차 누적 (기존 per-file 합산과 비트 단위 동일)
+            total = scores[:, c]
+            for k in range(idx.size):
+                total += contrib[:, k]
+            if details:
+                contributions[:, c, idx] = contrib
+        if details:
+            return scores, contributions
+        return scores
@@ -0,0 +1,246 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import parselmouth
+
+from prosody_audio import decode_pcm
+from prosody_engine import (FEATURE_GROUPS, FORMANT_FEATURES, PEAK_TARGET, SILENCE_THRESHOLD, FeatureEngine,
+                            formant_values, pause_features, percent_unvoiced)
+from prosody_timing import timed
+from prosody_praat import formant_tracks, intensity_silence_intervals, silent_durations
+
+
+# ==========================================
+# 병합 가능한 통계 (개수, 평균, 편차 제곱합 M2, 최대, 최소)
+# ==========================================
+def _moments(x):
+    if x.size == 0:
+        return (0, 0.0, 0.0, -np.inf, np.inf)
+    mean = float(np.mean(x))
+    return (x.size, mean, float(np.sum((x - mean) ** 2)), float(np.max(x)), float(np.min(x)))
+
+
+def _merge_moments(a, b):
+    """Chan 병렬 분산 공식으로 두 구간의 통계 병합"""
+    n = a[0] + b[0]
+    if a[0] == 0 or b[0] == 0:
+        return a if b[0] == 0 else b
+    delta = b[1] - a[1]
+    mean = a[1] + delta * b[0] / n
+    m2 = a[2] + b[2] + delta * delta * a[0] * b[0] / n
+    return (n, mean, m2, max(a[3], b[3]), min(a[4], b[4]))
+
+
+def _m_mean(m):
+    return m[1] if m[0] > 0 else 0
+
+
+def _m_std(m):
+    return np.sqrt(m[2] / m[0]) if m[0] > 0 else 0
+
+
+def features_from_moments(duration, time_step, pitch=None, intensity=None, formant=None, pauses=None,
+                          perturbation=None, names=None):
+    """
+    병합된 통계 -> raw_features (FeatureEngine과 같은 계산식, 분할 분석 / 답변 요약 / 스트리밍 공통)
+    - pitch / intensity: (개수, 평균, M2, 최대, 최소), formant: formant_values 키별 통계
+    - pauses: (휴지 길이 배열, 총 침묵 시간), perturbation: (shimmer, jitter)
+    - 없는(None) 통계의 Feature는 계산하지 않음 (무성음 비율은 pitch와 pauses가 모두 필요)
+    - names를 주면 그 Feature만 반환 (필요한 통계가 없으면 KeyError)
+    """
+    out = {}
+    if pitch is not None:
+        out["mean pitch"] = _m_mean(pitch)
+        out["max pitch"] = pitch[3] if pitch[0] > 0 else 0
+    if intensity is not None:
+        out["intensityMean"] = intensity[1]
+        out["intensityMax"] = intensity[3]
+        out["diffIntMaxMin"] = intensity[3] - intensity[4]
+        out["intensitySD"] = _m_std(intensity)
+    if formant is not None:
+        out.update({name: (_m_mean if stat == "mean" else _m_std)(formant[key])
+                    for name, (key, stat) in FORMANT_FEATURES.items() if key in formant})
+    if pauses is not None:
+        out.update(pause_features(*pauses, duration))
+        if pitch is not None:
+            out["percentUnvoiced"] = percent_unvoiced(duration, pauses[1], pitch[0], time_step)
+    if perturbation is not None:
+        out["shimmer"], out["jitter"] = perturbation[:2]
+    return out if names is None else {n: out[n] for n in names}
+
+
+# ==========================================
+# 분할 지점 탐색
+# ==========================================
+def find_cuts(pcm, sample_rate, segment_duration, min_cut_silence=1.0, frame=0.01):
+    """
+    긴 침묵의 중앙을 분할 지점(샘플 위치)으로 선택
+    - 10ms 프레임 RMS(dB)가 최대값 -35dB 미만인 구간이 min_cut_silence 이상이면 후보
+    - segment_duration마다 1개씩, 후보가 없으면 2배 길이에서 강제 분할
+    """
+    samples = np.frombuffer(pcm, dtype="<i2")
+    hop = int(frame * sample_rate)
+    n_frames = samples.size // hop
+    db = np.empty(n_frames)
+    step = 6000   # 60초 단위로 계산 (float 변환 메모리 제한)
+    for i in range(0, n_frames, step):
+        block = samples[i * hop:min(n_frames, i + step) * hop].reshape(-1, hop).astype(float)
+        db[i:i + block.shape[0]] = 10 * np.log10(np.mean(block ** 2, axis=1) + 1e-10)
+    silent = db < np.max(db, initial=0) + SILENCE_THRESHOLD
+
+    # 침묵 run의 중앙 프레임
+    change = np.flatnonzero(np.diff(silent.astype(np.int8))) + 1
+    bounds = np.concatenate(([0], change, [n_frames]))
+    centers = [(a + b) // 2 for a, b in zip(bounds[:-1], bounds[1:])
+               if silent[a] and (b - a) * frame >= min_cut_silence]
+
+    total = samples.size
+    seg = int(segment_duration * sample_rate)
+    cuts, last = [], 0
+    for c in [c * hop for c in centers] + [total]:
+        while c - last > 2 * seg:
+            last += seg
+            cuts.append(last)
+        if c - last >= seg and total - c >= seg // 2:
+            cuts.append(c)
+            last = c
+    return cuts
+
+
+# ==========================================
+# 세그먼트 분석 (워커 프로세스)
+# ==========================================
+def _segment_stats(params, groups, pcm, sample_rate, start, factor):
+    """
+    세그먼트 1개 분석 -> 병합 가능한 통계
+    - 전체 파일 기준 Peak Normalization 배율(factor)을 그대로 적용 (샘플 값이 전체 분석과 동일)
+    - Sound 시작 시각을 원본 위치로 두어 Formant 조회 격자가 전체 분석과 같음
+    """
+    values = np.frombuffer(pcm, dtype="<i2") / 32768.0 * factor
+    sound = parselmouth.Sound(values, sampling_frequency=sample_rate, start_time=start / sample_rate)
+    engine = FeatureEngine(sound, params)
+    stats = {"duration": sound.duration}
+
+    if groups & {"pitch", "unvoiced"}:
+        stats["pitch"] = _moments(engine.voiced_pitch)
+    if "intensity" in groups:
+        stats["intensity"] = _moments(engine.intensity.values[0])
+    if "formant" in groups:
+        step = int(round(params["time_step"] * sample_rate))
+        end = start + values.size
+        k0, k1 = -(-start // step), -(-end // step)
+        tracks = formant_tracks(engine.formant, np.arange(k0, k1) * params["time_step"], 3)
+        stats["formant"] = {k: _moments(v) for k, v in formant_values(*tracks).items()}
+    if groups & {"pause", "unvoiced"}:
+        # 침묵 판정은 전체 최대 강도 기준이어야 하므로 프레임 값만 반환 (병합 후 판정)
+        silence_int = sound.to_intensity(minimum_pitch=50.0)
+        stats["silence"] = (silence_int.xs(), silence_int.values[0].copy(), silence_int.dx)
+    if "perturbation" in groups:
+        values = engine.features(["shimmer", "jitter"])
+        stats["perturbation"] = (values["shimmer"], values["jitter"], engine.n_points)
+    return stats
+
+
+# ==========================================
+# 병합
+# ==========================================
+def _merge_silences(parts, duration):
+    """세그먼트별 침묵 판정용 Intensity 프레임을 전체 등간격 격자로 이어 붙여 한 번에 침묵 구간 판정"""
+    times = np.concatenate([p[0] for p in parts])
+    values = np.concatenate([p[1] for p in parts])
+    dx = parts[0][2]
+    # 세그먼트 경계의 빈 프레임(분석 창 절반)은 양쪽 침묵 프레임으로 보간
+    grid = np.arange(times[0], times[-1] + dx / 2, dx)
+    return silent_durations(*intensity_silence_intervals(grid, np.interp(grid, times, values), duration))
+
+
+def merge_segment_stats(parts, params):
+    """세그먼트 통계 목록(시간순) -> 전체 파일과 같은 raw_features 계산용 값"""
+    duration = sum(p["duration"] for p in parts)
+
+    def merged(key, sub=None):
+        m = (0, 0.0, 0.0, -np.inf, np.inf)
+        for p in parts:
+            m = _merge_moments(m, p[key] if sub is None else p[key][sub])
+        return m
+
+    stats = {}
+    if "pitch" in parts[0]:
+        stats["pitch"] = merged("pitch")
+    if "intensity" in parts[0]:
+        stats["intensity"] = merged("intensity")
+    if "formant" in parts[0]:
+        stats["formant"] = {k: merged("formant", k) for k in parts[0]["formant"]}
+    if "silence" in parts[0]:
+        stats["pauses"] = _merge_silences([p["silence"] for p in parts], duration)
+    if "perturbation" in parts[0]:
+        # 세그먼트별 shimmer / jitter를 주기(point) 수로 가중 평균
+        points = sum(p["perturbation"][2] for p in parts)
+        stats["perturbation"] = [sum(p["perturbation"][i] * p["perturbation"][2] for p in parts) / points
+                                 if points > 0 else 0 for i in (0, 1)]
+    return features_from_moments(duration, params["time_step"], **stats)
+
+
+def analyze_segmented(analyzer, file_path, segment_duration=300.0, workers=None,
+                      categories=None, features=None, sample_rate=None, timer=None):
+    """
+    긴 녹음(45~90분)용 분할 병렬 분석
+    1. 16bit PCM 디코딩 (분석 형식 WAV는 memory-map, 그 외 FFmpeg) -> 긴 침묵 중앙에서 segment_duration 단위로 분할
+    2. 세그먼트별 Feature 통계를 프로세스 풀에서 병렬 계산 (동시에 메모리에 있는 Praat 객체는 워커 수 x 세그먼트 크기)
+    3. 평균/표준편차는 (개수, 평균, M2) 병합, 최대값 유지, 침묵은 전체 Intensity 프레임으로 다시 판정
+       -> 경계를 가로지르는 휴지도 하나로 합쳐짐
+    """
+    sample_rate = sample_rate or analyzer.engine_params["sample_rate"]
+    # FFmpeg 출력도 임시 파일 memory-map으로 받음 (전체 PCM을 프로세스 힙에 두지 않음)
+    pcm, _ = timed(timer, "decode", lambda: decode_pcm(file_path, sample_rate, spill=True),
+                   lambda d: {"duration": len(d[0] or b"") / 2 / sample_rate, "decoder": d[1]})
+    if not pcm:
+        return None
+
+    names = analyzer._needed_features(categories, features)
+    groups = {FEATURE_GROUPS[n] for n in names}
+    samples = np.frombuffer(pcm, dtype="<i2")
+    step = 60 * sample_rate   # 60초 단위로 최대값 계산 (int32 변환 메모리 제한)
+    peak = max((int(np.max(np.abs(samples[i:i + step].astype(np.int32)))) for i in range(0, samples.size, step)),
+               default=0)
+    del samples
+    if peak == 0:
+        print("[Analysis Error] silent audio")
+        return None
+    factor = PEAK_TARGET / (peak / 32768.0)
+
+    bounds = [0] + find_cuts(pcm, sample_rate, segment_duration) + [len(pcm) // 2]
+    workers = min(workers or os.cpu_count() or 1, len(bounds) - 1)
+    t = time.perf_counter()
+    try:
+        if workers == 1:
+            # 워커 1개: 프로세스 풀 없이 순서대로 분석 (메모리는 세그먼트 1개 분량, daemon 프로세스에서도 사용 가능)
+            parts = [_segment_stats(analyzer.engine_params, groups, pcm[a * 2:b * 2], sample_rate, a, factor)
+                     for a, b in zip(bounds[:-1], bounds[1:])]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                # 실행 중 + 대기 세그먼트를 워커 수의 2배로 제한 (PCM 조각 복사본 메모리 제한)
+                pending, parts = {}, [None] * (len(bounds) - 1)
+                for i, (a, b) in enumerate(zip(bounds[:-1], bounds[1:])):
+                    if len(pending) >= 2 * workers:
+                        j = min(pending)
+                        parts[j] = pending.pop(j).result()
+                    pending[i] = pool.submit(_segment_stats, analyzer.engine_params, groups,
+                                             bytes(pcm[a * 2:b * 2]), sample_rate, a, factor)
+                for j, future in pending.items():
+                    parts[j] = future.result()
+        if timer is not None:
+            timer.record("segments", time.perf_counter() - t, segments=len(parts), workers=workers)
+        merged = timed(timer, "merge", lambda: merge_segment_stats(parts, analyzer.engine_params))
+        raw_features = {n: merged[n] for n in names}
+    except Exception as e:
+        print(f"[Analysis Error] {e}")
+        return None
+
+    if categories is None and features is not None:
+        categories = []
+    result = timed(timer, "scoring", lambda: analyzer._score(raw_features, categories))
+    result["metadata"]["segments"] = len(parts)
+    return result
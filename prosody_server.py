@@ -0,0 +1,350 @@
+import os
+import sys
+import json
+import math
+import time
+import queue
+import argparse
+import threading
+import itertools
+import multiprocessing as mp
+from multiprocessing import connection
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# 분석기 / NumPy / parselmouth는 워커 프로세스에서만 import (서버 프로세스는 요청 중계만 담당)
+from prosody_profiles import PRESETS, make_analyzer
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+
+def _worker_main(options, conn):
+    """
+    워커 프로세스: 두 분석기를 미리 생성하고 짧은 합성 음성으로 1회 분석(warm-up)한 뒤 작업 대기
+    작업: 전용 Pipe로 (job_id, preset, path, categories, features) 수신 -> 같은 Pipe로 (job_id, 결과, 에러) 전송
+    """
+    import numpy as np
+    import parselmouth
+
+    analyzers = {preset: make_analyzer(preset, **options) for preset in PRESETS}
+    # 1초 합성 음성 (0.6초 발화 + 침묵) -> Praat 분석 경로 1회 실행
+    t = np.arange(16000) / 16000
+    warmup = np.sin(2 * np.pi * 150 * t) * np.where(t < 0.6, 0.5, 0.001)
+    for analyzer in analyzers.values():
+        analyzer._analyze_sound(parselmouth.Sound(warmup, sampling_frequency=16000))
+    conn.send((None, "ready", None))
+
+    while True:
+        try:
+            item = conn.recv()
+        except EOFError:
+            break
+        if item is None:
+            break
+        job_id, preset, path, categories, features = item
+        try:
+            res = analyzers[preset].analyze(path, categories=categories, features=features)
+            err = None if res is not None else "analysis failed"
+        except Exception as e:
+            res, err = None, f"{type(e).__name__}: {e}"
+        conn.send((job_id, res, err))
+
+
+class _Worker:
+    """
+    워커 프로세스 1개 + 전용 Pipe + 처리 중인 작업 / 처리한 작업 수
+    (워커끼리 큐 / lock을 공유하지 않으므로 deadline 초과로 terminate해도 다른 워커의 결과 전달에 영향 없음)
+    """
+
+    def __init__(self, ctx, options):
+        self.conn, child_conn = ctx.Pipe()
+        self.proc = ctx.Process(target=_worker_main, args=(options, child_conn), daemon=True)
+        self.proc.start()
+        child_conn.close()   # 워커가 종료되면 recv가 EOFError
+        self.ready = False
+        self.job = None
+        self.jobs_done = 0
+
+    def submit(self, job):
+        self.job = job
+        job.started = time.monotonic()
+        self.conn.send((job.id, job.preset, job.path, job.categories, job.features))
+
+    def stop(self):
+        if self.proc.is_alive():
+            try:
+                self.conn.send(None)
+            except OSError:
+                pass
+
+    def kill(self):
+        if self.proc.is_alive():
+            self.proc.terminate()
+        self.proc.join()
+        self.conn.close()
+
+
+class Job:
+    """요청 1개 - status: queued / running / done / failed / timeout"""
+
+    def __init__(self, job_id, preset, path, categories, features, deadline):
+        self.id = job_id
+        self.preset = preset
+        self.path = path
+        self.categories = categories
+        self.features = features
+        self.deadline = deadline
+        self.started = None
+        self.status = "queued"
+        self.result = None
+        self.error = None
+        self.event = threading.Event()
+
+    def finish(self, status, result=None, error=None):
+        self.status, self.result, self.error = status, result, error
+        self.event.set()
+
+
+class AnalysisServer:
+    """
+    분석기를 미리 생성해 둔 워커 프로세스 풀 (요청마다 Python / 분석기 생성 비용 없음)
+    - 대기 큐 크기 제한: 가득 차면 submit이 queue.Full (HTTP 503 + Retry-After)
+    - 요청별 deadline: 대기 중 만료되면 실행하지 않음, 실행 중 만료되면 워커 종료 후 재생성
+    - 워커당 max_jobs개 처리 후 교체 (메모리 증가 제한, 교체 워커는 warm-up 후 투입)
+    """
+
+    def __init__(self, workers=None, queue_size=32, max_jobs=200, default_timeout=120.0,
+                 analyzer_options=None, poll_interval=0.05):
+        self.n_workers = workers or os.cpu_count() or 1
+        self.max_jobs = max_jobs
+        self.default_timeout = default_timeout
+        self.options = analyzer_options or {}
+        self.poll_interval = poll_interval
+        self.pending = queue.Queue(maxsize=queue_size)
+        self.stats = {"completed": 0, "failed": 0, "timeouts": 0, "rejected": 0, "recycled": 0, "crashed": 0}
+        self._ids = itertools.count()
+        self._avg_seconds = None
+        self._ctx = mp.get_context("spawn")   # 스레드가 있는 서버 프로세스에서 fork하지 않음
+        self._pool = []
+        self._retired = []   # 교체되어 남은 작업 없이 종료 중인 워커
+        self._thread = None
+        self._stopping = threading.Event()
+
+    # ------------------------------------------------------------------
+    # 시작 / 종료
+    # ------------------------------------------------------------------
+    def start(self, wait_ready=True):
+        self._pool = [_Worker(self._ctx, self.options) for _ in range(self.n_workers)]
+        self._thread = threading.Thread(target=self._dispatch, daemon=True)
+        self._thread.start()
+        while wait_ready and not all(w.ready for w in self._pool):
+            time.sleep(self.poll_interval)
+        return self
+
+    def close(self):
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join()
+        for w in self._pool:
+            w.stop()
+        for w in self._pool + self._retired:
+            w.proc.join(timeout=1.0)
+            w.kill()
+
+    # ------------------------------------------------------------------
+    # 요청
+    # ------------------------------------------------------------------
+    def submit(self, path, preset="light", categories=None, features=None, timeout=None):
+        """작업 등록 후 Job 반환 (job.event.wait() 후 status / result 확인), 큐가 가득 차면 queue.Full"""
+        if preset not in PRESETS:
+            raise ValueError(f"preset must be one of {tuple(PRESETS)}")
+        deadline = time.monotonic() + (timeout or self.default_timeout)
+        job = Job(next(self._ids), preset, path, categories, features, deadline)
+        try:
+            self.pending.put_nowait(job)
+        except queue.Full:
+            self.stats["rejected"] += 1
+            raise
+        return job
+
+    def retry_after(self):
+        """대기 큐가 비기까지 예상 시간(초) - 거절 응답의 재시도 힌트"""
+        avg = self._avg_seconds or 1.0
+        return max(1, math.ceil(avg * self.pending.qsize() / self.n_workers))
+
+    def health(self):
+        return {
+            "workers": len(self._pool),
+            "ready": sum(w.ready for w in self._pool),
+            "busy": sum(w.job is not None for w in self._pool),
+            "queued": self.pending.qsize(),
+            "avg_seconds": round(self._avg_seconds, 3) if self._avg_seconds else None,
+            **self.stats,
+        }
+
+    # ------------------------------------------------------------------
+    # 디스패처 스레드
+    # ------------------------------------------------------------------
+    def _replace(self, worker, recycle=False):
+        """워커 교체 (recycle이면 정상 종료 요청, 아니면 강제 종료)"""
+        if recycle:
+            worker.stop()
+            self._retired.append(worker)
+        else:
+            worker.kill()
+        self._pool[self._pool.index(worker)] = _Worker(self._ctx, self.options)
+
+    def _dispatch(self):
+        while not self._stopping.is_set():
+            # [1] 준비된 유휴 워커에 작업 할당 (대기 중 deadline이 지난 작업은 실행하지 않음)
+            for w in self._pool:
+                while w.ready and w.job is None:
+                    try:
+                        job = self.pending.get_nowait()
+                    except queue.Empty:
+                        break
+                    if time.monotonic() > job.deadline:
+                        self.stats["timeouts"] += 1
+                        job.finish("timeout", error="deadline exceeded while queued")
+                        continue
+                    job.status = "running"
+                    w.submit(job)
+
+            # [2] 결과 / 준비 완료 메시지 수신 - 워커별 Pipe와 프로세스 종료(sentinel)를 함께 대기
+            ready = connection.wait([w.conn for w in self._pool] + [w.proc.sentinel for w in self._pool],
+                                    timeout=self.poll_interval)
+            for w in list(self._pool):
+                if w.conn not in ready:
+                    continue
+                try:
+                    job_id, res, err = w.conn.recv()
+                except EOFError:
+                    # 결과 전송 전에 종료된 워커 -> [3]에서 정리
+                    w.proc.join()
+                    continue
+                if job_id is None:
+                    w.ready = True
+                elif w.job is not None and w.job.id == job_id:
+                    job, w.job = w.job, None
+                    seconds = time.monotonic() - job.started
+                    self._avg_seconds = seconds if self._avg_seconds is None else 0.9 * self._avg_seconds + 0.1 * seconds
+                    if err is None:
+                        self.stats["completed"] += 1
+                        job.finish("done", result=res)
+                    else:
+                        self.stats["failed"] += 1
+                        job.finish("failed", error=err)
+                    w.jobs_done += 1
+                    if w.jobs_done >= self.max_jobs:
+                        self.stats["recycled"] += 1
+                        self._replace(w, recycle=True)
+
+            # [3] 실행 중 deadline 초과 / 비정상 종료 워커 정리
+            for w in [w for w in self._retired if not w.proc.is_alive()]:
+                w.kill()
+                self._retired.remove(w)
+            now = time.monotonic()
+            for w in list(self._pool):
+                if w.job is not None and now > w.job.deadline:
+                    self.stats["timeouts"] += 1
+                    w.job.finish("timeout", error="deadline exceeded")
+                    self._replace(w)
+                elif not w.proc.is_alive():
+                    self.stats["crashed"] += 1
+                    if w.job is not None:
+                        w.job.finish("failed", error=f"worker exited with code {w.proc.exitcode}")
+                    self._replace(w)
+
+
+# ==========================================
+# HTTP (localhost)
+# ==========================================
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "ProsodyServer/1.0"
+
+    def _send(self, code, body, headers=()):
+        data = json.dumps(body, default=float).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for k, v in headers:
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send(200, self.server.analysis.health())
+        else:
+            self._send(404, {"error": "not found"})
+
+    def do_POST(self):
+        """POST /analyze {"path", "preset", "categories", "features", "timeout"}"""
+        if self.path != "/analyze":
+            self._send(404, {"error": "not found"})
+            return
+        analysis = self.server.analysis
+        try:
+            req = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            job = analysis.submit(req["path"], preset=req.get("preset", "light"), categories=req.get("categories"),
+                                  features=req.get("features"), timeout=req.get("timeout"))
+        except queue.Full:
+            retry = analysis.retry_after()
+            self._send(503, {"error": "queue full", "retry_after": retry}, [("Retry-After", str(retry))])
+            return
+        except (ValueError, KeyError, TypeError) as e:
+            self._send(400, {"error": f"bad request: {e}"})
+            return
+
+        job.event.wait(max(0.0, job.deadline - time.monotonic()) + 5.0)
+        if job.status == "done":
+            self._send(200, {"result": job.result})
+        elif job.status == "failed":
+            self._send(422, {"error": job.error})
+        else:
+            self._send(504, {"error": job.error or "deadline exceeded"})
+
+    def log_message(self, fmt, *args):
+        pass
+
+
+def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, **server_options):
+    """워커 warm-up 후 HTTP 서버 실행 (Ctrl+C로 종료)"""
+    analysis = AnalysisServer(**server_options).start()
+    httpd = ThreadingHTTPServer((host, port), _Handler)
+    httpd.daemon_threads = True
+    httpd.analysis = analysis
+    print(f"[server] http://{host}:{port} ({analysis.n_workers} workers ready)")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        httpd.server_close()
+        analysis.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prosody 분석 서버 (분석기를 미리 생성한 워커 풀)")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--queue-size", type=int, default=32, help="대기 요청 최대 개수 (초과 시 503)")
+    parser.add_argument("--max-jobs", type=int, default=200, help="워커 교체 주기 (처리 작업 수)")
+    parser.add_argument("--timeout", type=float, default=120.0, help="기본 요청 deadline (초)")
+    parser.add_argument("--profile", help="분석 프로파일 (기본: 분석기 기본값)")
+    parser.add_argument("--sounding-only", action="store_true")
+    parser.add_argument("--memory-budget", type=int, help="요청 1개 메모리 예산 (MiB, 초과 입력은 --over-budget 정책)")
+    parser.add_argument("--over-budget", choices=("reject", "truncate", "chunked"), default="reject")
+    args = parser.parse_args(argv)
+
+    options = {"profile": args.profile, "sounding_only": args.sounding_only}
+    if args.memory_budget is not None:
+        options.update(memory_budget=args.memory_budget << 20, over_budget=args.over_budget)
+    serve(args.host, args.port, workers=args.workers, queue_size=args.queue_size, max_jobs=args.max_jobs,
+          default_timeout=args.timeout, analyzer_options=options)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+import numpy as np
+
+from prosody_engine import FEATURE_GROUPS, formant_values
+from prosody_segment import _merge_moments, _moments, features_from_moments
+
+# ==========================================
+# 답변별 요약 통계 (JSON 직렬화 가능, 병합 가능)
+# ==========================================
+# - pitch / intensity / formant: (개수, 평균, 편차 제곱합 M2, 최대, 최소)
+# - pauses: 침묵 구간 길이 목록 + 처음/끝이 침묵인지 (이어 붙일 때 경계 침묵을 하나로 합침)
+# - perturbation: (shimmer, jitter, 주기(point) 수) - 병합 시 주기 수로 가중 평균
+
+
+def _pack(m):
+    return [int(m[0]), float(m[1]), float(m[2]), float(m[3]), float(m[4])] if m[0] > 0 else [0, 0.0, 0.0, 0.0, 0.0]
+
+
+def _unpack(m):
+    return tuple(m) if m[0] > 0 else (0, 0.0, 0.0, -np.inf, np.inf)
+
+
+def summarize(engine, names):
+    """FeatureEngine -> names의 Feature를 다시 계산할 수 있는 요약 통계"""
+    groups = {FEATURE_GROUPS[n] for n in names}
+    summary = {"answers": 1, "duration": float(engine.duration), "time_step": engine.params["time_step"],
+               "pitch": _pack(_moments(engine.voiced_pitch))}
+    if "intensity" in groups:
+        summary["intensity"] = _pack(_moments(engine.intensity_values))
+    if "formant" in groups:
+        summary["formant"] = {k: _pack(_moments(v)) for k, v in formant_values(*engine.formant_tracks).items()}
+    if groups & {"pause", "unvoiced"}:
+        starts, ends, labels = engine.silences
+        silent = labels == "silent"
+        summary["pauses"] = {"durations": [float(d) for d in ends[silent] - starts[silent]],
+                             "lead": bool(silent[0]) if silent.size else False,
+                             "trail": bool(silent[-1]) if silent.size else False}
+    if "perturbation" in groups:
+        values = engine.features(["shimmer", "jitter"])
+        summary["perturbation"] = [float(values["shimmer"]), float(values["jitter"]), engine.n_points]
+    return summary
+
+
+def _merge_pauses(a, b):
+    durations, rest = list(a["durations"]), list(b["durations"])
+    if a["trail"] and b["lead"]:
+        # 앞 답변 끝 침묵 + 다음 답변 시작 침묵 -> 이어 붙인 오디오에서는 하나의 휴지
+        durations[-1] += rest.pop(0)
+    return {"durations": durations + rest, "lead": a["lead"], "trail": b["trail"]}
+
+
+def merge_summaries(summaries):
+    """
+    답변별 요약 목록(시간순) -> 답변을 이어 붙인 세션 1개의 요약
+    모든 요약에 공통으로 있는 통계만 병합 (같은 분석기 / 프로파일로 만든 요약이어야 함)
+    """
+    summaries = list(summaries)
+    time_steps = {s["time_step"] for s in summaries}
+    if len(time_steps) > 1:
+        raise ValueError(f"summaries use different time steps: {sorted(time_steps)}")
+
+    out = {"answers": sum(s["answers"] for s in summaries),
+           "duration": sum(s["duration"] for s in summaries), "time_step": summaries[0]["time_step"]}
+    for key in ("pitch", "intensity"):
+        if all(key in s for s in summaries):
+            m = _unpack(summaries[0][key])
+            for s in summaries[1:]:
+                m = _merge_moments(m, _unpack(s[key]))
+            out[key] = _pack(m)
+    if all("formant" in s for s in summaries):
+        out["formant"] = {}
+        for k in summaries[0]["formant"]:
+            m = _unpack(summaries[0]["formant"][k])
+            for s in summaries[1:]:
+                m = _merge_moments(m, _unpack(s["formant"][k]))
+            out["formant"][k] = _pack(m)
+    if all("pauses" in s for s in summaries):
+        pauses = summaries[0]["pauses"]
+        for s in summaries[1:]:
+            pauses = _merge_pauses(pauses, s["pauses"])
+        out["pauses"] = pauses
+    if all("perturbation" in s for s in summaries):
+        points = sum(s["perturbation"][2] for s in summaries)
+        out["perturbation"] = [
+            sum(s["perturbation"][i] * s["perturbation"][2] for s in summaries) / points if points > 0 else 0
+            for i in (0, 1)] + [points]
+    return out
+
+
+def summary_features(summary, names):
+    """요약 통계 -> raw_features (FeatureEngine과 같은 계산식, 필요한 통계가 없으면 KeyError)"""
+    groups = {FEATURE_GROUPS[n] for n in names}
+    stats = {"pitch": summary["pitch"]}
+    if "intensity" in groups:
+        stats["intensity"] = summary["intensity"]
+    if "formant" in groups:
+        stats["formant"] = summary["formant"]
+    if groups & {"pause", "unvoiced"}:
+        pause_durs = np.asarray(summary["pauses"]["durations"])
+        stats["pauses"] = (pause_durs, np.cumsum(pause_durs)[-1] if pause_durs.size > 0 else 0)
+    if "perturbation" in groups:
+        stats["perturbation"] = summary["perturbation"]
+    return features_from_moments(summary["duration"], summary["time_step"], names=names, **stats)
@@ -0,0 +1,35 @@
+import time
+
+
+class StageTimer:
+    """
+    분석 단계별 소요 시간(monotonic) + 입력 크기 기록
+    - stages: {단계 이름: {"seconds": 초, 크기 항목(duration / frames / intervals / points)...}}
+    - hook(stage, record): 단계가 끝날 때마다 호출 (메트릭 시스템 전달용)
+    """
+
+    def __init__(self, hook=None):
+        self.stages = {}
+        self.hook = hook
+
+    def record(self, stage, seconds, **sizes):
+        rec = {"seconds": round(seconds, 6), **sizes}
+        self.stages[stage] = rec
+        if self.hook is not None:
+            self.hook(stage, rec)
+        return rec
+
+    def run(self, stage, fn, sizes=None):
+        """fn() 실행 시간 기록 후 결과 반환 (sizes: 결과 -> 크기 dict, 결과가 None이면 생략)"""
+        t = time.perf_counter()
+        out = fn()
+        seconds = time.perf_counter() - t
+        self.record(stage, seconds, **(sizes(out) if sizes is not None and out is not None else {}))
+        return out
+
+
+def timed(timer, stage, fn, sizes=None):
+    """timer가 None이면 fn()만 실행 (계측 비활성 시 추가 비용은 None 비교 1회)"""
+    if timer is None:
+        return fn()
+    return timer.run(stage, fn, sizes)
@@ -0,0 +1,125 @@
+import os
+import json
+
+import numpy as np
+
+# 배열로 저장되는 트랙 열 (나머지 duration / time_step / shimmer / jitter는 인덱스에 값으로 저장)
+ARRAY_COLUMNS = ("pitch", "intensity", "formant_freqs", "formant_bws",
+                 "silence_starts", "silence_ends", "silence_silent")
+
+
+class TrackStore:
+    """
+    프레임 단위 트랙 저장소 (analyze(keep_tracks=True)의 result["tracks"])
+    - 녹음 chunk_size개씩 열(column)별로 이어 붙여 chunk_NNNNN.npz 1개로 저장 (비압축, float32)
+    - index.jsonl: 녹음 1개당 1줄 {key, chunk, 열별 [start, stop), 스칼라 값, 분석기 변형}
+      같은 key가 다시 저장되면 마지막 줄이 유효
+    - 재채점은 chunk 단위로 읽어 NumPy 집계만 수행 (FFmpeg / Praat 불필요)
+    - 쓰기는 프로세스 1개 기준 (병렬 분석은 ingest처럼 결과를 모아서 저장)
+    """
+
+    def __init__(self, root, chunk_size=256):
+        self.root = root
+        self.chunk_size = chunk_size
+        self._pending = []     # (key, tracks, variant)
+        os.makedirs(root, exist_ok=True)
+        self.index = {}
+        self._n_chunks = 0
+        index_path = os.path.join(root, "index.jsonl")
+        if os.path.exists(index_path):
+            with open(index_path) as f:
+                for line in f:
+                    entry = json.loads(line)
+                    self.index[entry["key"]] = entry
+                    self._n_chunks = max(self._n_chunks, int(entry["chunk"][6:11]) + 1)
+
+    def __len__(self):
+        return len(self.index) + len(self._pending)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.flush()
+
+    def add(self, key, tracks, variant=None):
+        """트랙 1개 추가 (chunk_size개가 모이면 디스크에 기록)"""
+        self._pending.append((key, tracks, variant))
+        if len(self._pending) >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        """대기 중인 트랙을 chunk 파일 1개로 기록 후 인덱스 추가"""
+        if not self._pending:
+            return
+        chunk = f"chunk_{self._n_chunks:05d}.npz"
+        columns, entries = {}, []
+        for key, tracks, variant in self._pending:
+            slices = {}
+            for col in ARRAY_COLUMNS:
+                if col not in tracks:
+                    continue
+                parts = columns.setdefault(col, [])
+                start = sum(len(p) for p in parts)
+                parts.append(np.asarray(tracks[col]))
+                slices[col] = [start, start + len(tracks[col])]
+            scalars = {k: float(v) for k, v in tracks.items() if k not in ARRAY_COLUMNS}
+            entries.append({"key": key, "chunk": chunk, "slices": slices, "scalars": scalars, "variant": variant})
+
+        # 임시 파일에 쓴 뒤 rename -> 중단되어도 인덱스에는 완성된 chunk만 기록됨
+        tmp = os.path.join(self.root, chunk + ".tmp")
+        with open(tmp, "wb") as f:
+            np.savez(f, **{col: np.concatenate(parts) for col, parts in columns.items()})
+        os.replace(tmp, os.path.join(self.root, chunk))
+        with open(os.path.join(self.root, "index.jsonl"), "a") as f:
+            for entry in entries:
+                f.write(json.dumps(entry) + "\n")
+                self.index[entry["key"]] = entry
+        self._n_chunks += 1
+        self._pending = []
+
+    def _tracks(self, entry, arrays):
+        tracks = dict(entry["scalars"])
+        for col, (a, b) in entry["slices"].items():
+            tracks[col] = arrays[col][a:b]
+        return tracks
+
+    def load(self, key):
+        """key 1개의 트랙 dict"""
+        self.flush()
+        entry = self.index[key]
+        with np.load(os.path.join(self.root, entry["chunk"])) as arrays:
+            return self._tracks(entry, {col: arrays[col] for col in entry["slices"]})
+
+    def iter_tracks(self, keys=None):
+        """(key, 트랙 dict)를 chunk 순서로 yield (chunk 파일은 한 번씩만 읽음)"""
+        self.flush()
+        wanted = set(self.index) if keys is None else set(keys)
+        by_chunk = {}
+        for key, entry in self.index.items():
+            if key in wanted:
+                by_chunk.setdefault(entry["chunk"], []).append(entry)
+        for chunk in sorted(by_chunk):
+            with np.load(os.path.join(self.root, chunk)) as npz:
+                arrays = {col: npz[col] for col in npz.files}
+            for entry in by_chunk[chunk]:
+                yield entry["key"], self._tracks(entry, arrays)
+
+    def rescore(self, analyzer, keys=None, categories=None, features=None):
+        """저장된 트랙으로 raw_features 재계산 + 현재 가중치 / 기준 분포로 재채점 -> {key: 결과}"""
+        return {key: analyzer.features_from_tracks(tracks, categories=categories, features=features)
+                for key, tracks in self.iter_tracks(keys)}
+
+    def ingest(self, analyzer, paths, workers=None, timeout=None):
+        """
+        여러 파일을 analyze_many로 병렬 분석하여 트랙 저장 (key = 파일 경로)
+        analyzer는 keep_tracks=True여야 함, 반환: {path: 결과 (tracks 제외) 또는 Exception}
+        """
+        results = {}
+        variant = analyzer._cache_variant()
+        for path, res in analyzer.analyze_many(paths, workers=workers, timeout=timeout):
+            if isinstance(res, dict) and "tracks" in res:
+                self.add(path, res.pop("tracks"), variant)
+            results[path] = res
+        self.flush()
+        return results
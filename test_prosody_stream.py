@@ -0,0 +1,48 @@
+import numpy as np
+
+from prosody_stream import StreamingProsodyAnalyzer
+
+
+def _speech_like_pcm(seconds=6.0, sample_rate=16000, seed=0):
+    """발화(배음 + 비브라토) / 휴지가 번갈아 나오는 16bit little-endian PCM 바이트"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    f0 = 140 + 20 * np.sin(2 * np.pi * 0.5 * t)
+    phase = 2 * np.pi * np.cumsum(f0) / sample_rate
+    voice = sum(np.sin(k * phase) / k for k in range(1, 6))
+    gate = (t % 2.0) < 1.3
+    signal = 0.3 * voice * gate + 0.001 * rng.standard_normal(t.size)
+    return (np.clip(signal, -1, 1) * 32767).astype("<i2").tobytes()
+
+
+def _stream(pcm, chunk_sizes):
+    stream = StreamingProsodyAnalyzer()
+    updates = []
+    pos, i = 0, 0
+    while pos < len(pcm):
+        size = chunk_sizes[i % len(chunk_sizes)]
+        updates += stream.feed(pcm[pos:pos + size])
+        pos, i = pos + size, i + 1
+    return updates, stream.finalize()
+
+
+def test_odd_sized_byte_chunks():
+    """홀수 길이 바이트 청크도 짝수 청크(샘플 단위)와 같은 결과"""
+    pcm = _speech_like_pcm()
+    even_updates, even_final = _stream(pcm, [8000])
+    odd_updates, odd_final = _stream(pcm, [4001, 3999, 1, 7777])
+    assert even_final is not None
+    assert odd_updates == even_updates
+    assert odd_final == even_final
+
+
+def test_reset_drops_leftover_byte():
+    """reset() 후에는 이전 세션의 남은 바이트가 새 세션 앞에 붙지 않음"""
+    pcm = _speech_like_pcm(seconds=3.0)
+    stream = StreamingProsodyAnalyzer()
+    stream.feed(pcm[:1001])
+    stream.reset()
+    stream.feed(pcm)
+    fresh = StreamingProsodyAnalyzer()
+    fresh.feed(pcm)
+    assert stream.finalize() == fresh.finalize()